@@ -0,0 +1,47 @@
+/**
+ * Client-side HIPAA Highlighting for DEID Patients
+ *
+ * This script renders the highlighted original text in the browser from the
+ * raw text and compact [start, end, color] spans stored in highlighted-text-store,
+ * so the server does not have to build and ship the full HTML document.
+ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    highlight: {
+        render: function(data) {
+            if (!data || !data.text) {
+                return window.dash_clientside.no_update;
+            }
+
+            // Offsets from Python count code points, so slice on code points too
+            const chars = Array.from(data.text);
+            const parts = [];
+            let cursor = 0;
+
+            for (const [start, end, color] of (data.entities || [])) {
+                parts.push(escapeHtml(chars.slice(cursor, start).join('')));
+                parts.push(
+                    '<span style="background-color: ' + color + '; padding: 2px 4px; border-radius: 3px; font-weight: bold; color: black;">' +
+                    escapeHtml(chars.slice(start, end).join('')) +
+                    '</span>'
+                );
+                cursor = end;
+            }
+            parts.push(escapeHtml(chars.slice(cursor).join('')));
+
+            // Same document structure the server used to build
+            return '<html><head><style>' +
+                'body { font-family: monospace; font-size: 14px; line-height: 1.6; padding: 15px; white-space: pre-wrap; }' +
+                '</style></head><body>' + parts.join('') + '</body></html>';
+        }
+    }
+});
+
+function escapeHtml(text) {
+    return text
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#x27;');
+}
@@ -20,7 +20,18 @@ import spacy
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
 from presidio_analyzer import AnalyzerEngine
-from presidio_analyzer.nlp_engine import NlpEngineProvider
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+# spaCy components never consumed downstream. Presidio only reads entities,
+# tokens and lemmas, so the dependency parser is skipped entirely; the tagger,
+# attribute_ruler and lemmatizer stay because lemmas drive context enhancement.
+SPACY_EXCLUDED_COMPONENTS = ["parser"]
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+try:
+    from yaml import CSafeLoader as YAML_SAFE_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_SAFE_LOADER
 
 
 class ConfigurationError(Exception):
@@ -70,20 +81,15 @@ class ConfigurationLoader:
         ]
 
         paths_to_try = [config_path] if config_path else default_paths
-        config_data = None
-        config_file = None
-
-        # Find and load the main config file
-        for path in paths_to_try:
-            if path and os.path.exists(path):
-                config_file = Path(path)
-                config_data = self._load_yaml_file(config_file)
-                break
 
-        if config_data is None:
+        # Resolve the first existing path, then load only that file
+        found_path = next((path for path in paths_to_try if path and os.path.exists(path)), None)
+        if found_path is None:
             raise ConfigurationError(
                 f"No valid configuration file found. Tried: {', '.join(str(p) for p in paths_to_try)}"
             )
+        config_file = Path(found_path)
+        config_data = self._load_yaml_file(config_file)
 
         # Process imports if present
         config = self._process_imports(config_data, config_file.parent)
@@ -106,7 +112,7 @@ class ConfigurationLoader:
         """Load a YAML file and return its contents."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=YAML_SAFE_LOADER) or {}
         except Exception as e:
             raise ConfigurationError(f"Error loading configuration from {file_path}: {e}")
 
@@ -219,8 +225,8 @@ class ModelManager:
             return self._spacy_models[model_name]
 
         try:
-            # Try to load the model
-            nlp = spacy.load(model_name)
+            # Try to load the model without unused components
+            nlp = spacy.load(model_name, exclude=SPACY_EXCLUDED_COMPONENTS)
             self._spacy_models[model_name] = nlp
             return nlp
         except OSError:
@@ -228,7 +234,7 @@ class ModelManager:
             try:
                 print(f"Downloading spaCy model: {model_name}")
                 spacy.cli.download(model_name)
-                nlp = spacy.load(model_name)
+                nlp = spacy.load(model_name, exclude=SPACY_EXCLUDED_COMPONENTS)
                 self._spacy_models[model_name] = nlp
                 return nlp
             except Exception as e:
@@ -256,11 +262,12 @@ class ModelManager:
             # Load the spaCy model
             nlp = self.load_spacy_model(spacy_model_name)
 
-            # Create NLP engine provider
-            provider = NlpEngineProvider()
-
-            # Create the NLP engine
-            nlp_engine = provider.create_engine()
+            # Create the NLP engine around the already-loaded model instead of
+            # letting Presidio load a second, full-pipeline copy
+            nlp_engine = SpacyNlpEngine(
+                models=[{"lang_code": "en", "model_name": spacy_model_name}]
+            )
+            nlp_engine.nlp = {"en": nlp}
 
             # Create and cache the analyzer
             analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
@@ -4,11 +4,19 @@ Configuration Loader
 This module provides functions for loading, merging, and validating configuration settings.
 It supports hierarchical configuration with imports and environment-specific overrides.
 """
+import copy
+import functools
 import os
 import yaml
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+try:
+    from yaml import CSafeLoader as YAML_SAFE_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_SAFE_LOADER
+
 
 class ConfigurationError(Exception):
     """Exception raised for configuration errors."""
@@ -44,6 +52,22 @@ def _resolve_path(path: Union[str, Path], base_dir: Optional[Union[str, Path]] =
     return path_obj
 
 
+@functools.lru_cache(maxsize=16)
+def _parse_yaml_file(abs_path: str, mtime: float) -> Dict:
+    """
+    Parse a YAML file, memoized per absolute path and modification time.
+    
+    Args:
+        abs_path: Absolute path to the YAML file
+        mtime: Modification time of the file; an edited file misses the cache
+        
+    Returns:
+        Dictionary containing the YAML content (shared; callers must copy it)
+    """
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_SAFE_LOADER) or {}
+
+
 def _load_yaml_file(file_path: Union[str, Path]) -> Dict:
     """
     Load a YAML file.
@@ -58,8 +82,9 @@ def _load_yaml_file(file_path: Union[str, Path]) -> Dict:
         ConfigurationError: If the file cannot be loaded
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+        abs_path = os.path.abspath(file_path)
+        # Deep copy so callers can merge into and mutate the result freely
+        return copy.deepcopy(_parse_yaml_file(abs_path, os.stat(abs_path).st_mtime))
     except Exception as e:
         raise ConfigurationError(f"Error loading configuration from {file_path}: {e}")
 
@@ -115,24 +140,16 @@ def load_config(config_path: Optional[Union[str, Path]] = None,
     # Use the provided path or try defaults
     paths_to_try = [config_path] if config_path else default_paths
     
-    # Try each path
-    config_file = None
-    config_data = None
-    
-    for path in paths_to_try:
-        if path and os.path.exists(path):
-            config_file = path
-            config_data = _load_yaml_file(path)
-            break
-                
-    # If we get here and no valid configuration was found, raise an error
-    if config_data is None:
+    # Resolve the first existing path, then load only that file
+    config_file = next((path for path in paths_to_try if path and os.path.exists(path)), None)
+    if config_file is None:
         raise ConfigurationError(
             f"No valid configuration file found. Tried: {', '.join(str(p) for p in paths_to_try)}"
         )
+    config_data = _load_yaml_file(config_file)
     
     # Process imports if present
-    base_dir = os.path.dirname(config_file) if config_file else None
+    base_dir = os.path.dirname(config_file)
     config = _process_imports(config_data, base_dir)
     
     # Apply environment-specific configuration if specified
@@ -17,17 +17,36 @@ Focus: Clinical Data De-Identification as per HIPAA Compliance
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, callback, dash_table
+from dash import dcc, html, Input, Output, State, callback, dash_table, ClientsideFunction
 import plotly.graph_objs as go
 import re
 import json
 from datetime import datetime
+from html import escape
+from html.parser import HTMLParser
 import base64
 import io
 import sys
 import os
+import functools
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+# Optional linear-time regex engine for the HIPAA patterns; falls back to re
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional on-disk memoization of backend results across processes/restarts
+try:
+    from joblib import Memory
+except ImportError:
+    Memory = None
+
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -35,6 +54,14 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
 from config.config import config as global_config
 
+# Module logger; level and format come from the environment's logging settings
+_logging_config = global_config.get_logging_config()
+logging.basicConfig(
+    level=_logging_config.get('level', 'INFO'),
+    format=_logging_config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+logger = logging.getLogger(__name__)
+
 # Initialize Dash app with professional healthcare styling
 app = dash.Dash(
     __name__, 
@@ -87,6 +114,24 @@ HEALTHCARE_COLORS = {
     'info': '#17a2b8'           # Info blue
 }
 
+# Highlight palette shared by regex patterns and backend entity types
+HIGHLIGHT_PALETTE = ('#ffeb3b', '#ff9800', '#f44336', '#9c27b0', '#2196f3', '#4caf50', '#ff5722', '#795548')
+
+# Backend entity type -> highlight color (unknown types use HIGHLIGHT_PALETTE[0])
+ENTITY_TYPE_COLORS = {
+    'PERSON': HIGHLIGHT_PALETTE[0],      # Yellow
+    'SSN': HIGHLIGHT_PALETTE[1],         # Orange
+    'PHONE_NUMBER': HIGHLIGHT_PALETTE[2], # Red
+    'EMAIL_ADDRESS': HIGHLIGHT_PALETTE[3], # Purple
+    'LOCATION': HIGHLIGHT_PALETTE[4],    # Blue
+    'DATE_TIME': HIGHLIGHT_PALETTE[5],   # Green
+    'MEDICAL_RECORD_NUMBER': HIGHLIGHT_PALETTE[6], # Orange-red
+    'HEALTH_PLAN_ID': HIGHLIGHT_PALETTE[7], # Brown
+    'NAME': HIGHLIGHT_PALETTE[0],        # Yellow
+    'ADDRESS': HIGHLIGHT_PALETTE[4],     # Blue
+    'DATE': HIGHLIGHT_PALETTE[5],        # Green
+}
+
 # HIPAA identifier patterns for highlighting
 HIPAA_PATTERNS = {
     'names': r'\b[A-Z][a-z]+ [A-Z][a-z]+\b',
@@ -99,100 +144,132 @@ HIPAA_PATTERNS = {
     'insurance': r'\bPolicy\s*:?\s*\d+\b'
 }
 
-def highlight_hipaa_identifiers(text):
+def compile_hipaa_pattern(pattern, ignore_case=False):
+    """
+    Compile a HIPAA pattern with RE2 when google-re2 is installed, otherwise with re
+    RE2 matches in linear time, so patterns like 'address' cannot backtrack catastrophically;
+    a pattern RE2 rejects (e.g. one using backreferences or lookarounds) falls back to re
+    """
+    if re2 is not None:
+        options = re2.Options()
+        options.max_mem = 8 << 20
+        options.case_sensitive = not ignore_case
+        try:
+            return re2.compile(pattern, options)
+        except re2.error as e:
+            logger.warning("RE2 rejected HIPAA pattern %r, using re: %s", pattern, e)
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+# Patterns whose matches change with case-insensitive matching; the others only
+# use digits, punctuation or explicit [A-Za-z] classes, so IGNORECASE is pure overhead there
+HIPAA_CASELESS_PATTERNS = {'names', 'medical_record', 'insurance'}
+
+# Each HIPAA pattern compiled once, case-insensitive only where it matters
+HIPAA_COMPILED = {
+    name: compile_hipaa_pattern(pattern, ignore_case=name in HIPAA_CASELESS_PATTERNS)
+    for name, pattern in HIPAA_PATTERNS.items()
+}
+
+# Literal every match of a pattern must contain (lowercase); when it is absent from
+# the lowercased text the pattern cannot match and its scan is skipped
+HIPAA_PATTERN_KEYWORDS = {
+    'ssn': '-',
+    'phone': '-',
+    'email': '@',
+    'dates': '/',
+    'medical_record': 'mrn',
+    'insurance': 'policy'
+}
+
+# All HIPAA patterns merged into one alternation so the text is scanned in a single pass;
+# the matching pattern is recovered from m.lastgroup. Case-insensitivity is scoped per group
+HIPAA_COMBINED = compile_hipaa_pattern(
+    '|'.join(
+        f'(?P<{name}>(?i:{pattern}))' if name in HIPAA_CASELESS_PATTERNS else f'(?P<{name}>{pattern})'
+        for name, pattern in HIPAA_PATTERNS.items()
+    )
+)
+
+def find_hipaa_spans(text):
+    """
+    Find non-overlapping HIPAA pattern matches as (start, end, pattern_name) tuples
+    """
+    return [(m.start(), m.end(), m.lastgroup) for m in HIPAA_COMBINED.finditer(text)]
+
+# Replacement tokens used by the regex fallback de-identification
+HIPAA_REPLACEMENTS = {
+    'names': '[PATIENT NAME]',
+    'ssn': '[SSN]',
+    'phone': '[PHONE]',
+    'email': '[EMAIL]',
+    'dates': '[DATE]',
+    'medical_record': 'MRN: [REDACTED]',
+    'insurance': 'Policy: [REDACTED]'
+}
+
+# Case-sensitive alternation of the replaced patterns (names must stay capitalized)
+HIPAA_FALLBACK_COMBINED = compile_hipaa_pattern(
+    '|'.join(f'(?P<{name}>{HIPAA_PATTERNS[name]})' for name in HIPAA_REPLACEMENTS)
+)
+
+# Highlight color for each pattern, in pattern order
+HIPAA_PATTERN_COLORS = {
+    name: color for name, color in zip(
+        HIPAA_PATTERNS,
+        HIGHLIGHT_PALETTE
+    )
+}
+
+def get_highlight_spans(text, entities=None):
     """
-    Highlight HIPAA identifiers in text with different colors using real backend detection
-    Returns formatted text with markdown-style highlighting
+    Compute highlight spans as compact [start, end, color] lists (JSON-friendly)
+    Uses entities from the real backend when given, otherwise falls back to regex patterns
+    Spans are sorted by start and never overlap
     """
     if not text:
-        return ""
+        return []
     
-    try:
-        # Try to use the real backend for more accurate detection
-        deid = initialize_deidentifier()
-        if deid is not None:
-            result = deid.deidentify(text)
-            entities = result.get("entities", [])
-            
-            # Create highlighted text using real entity detection
-            highlighted_text = text
-            colors = ['#ffeb3b', '#ff9800', '#f44336', '#9c27b0', '#2196f3', '#4caf50', '#ff5722', '#795548']
-            
-            # Sort entities by start position (descending) to avoid offset issues
-            entities_sorted = sorted(entities, key=lambda x: x.get('start', 0), reverse=True)
-            
-            for entity in entities_sorted:
-                start = entity.get('start', 0)
-                end = entity.get('end', 0)
-                entity_type = entity.get('category', 'UNKNOWN')
-                
-                if start < end and start >= 0 and end <= len(text):
-                    # Get color based on entity type
-                    color = get_entity_color(entity_type, colors)
-                    
-                    # Extract the text to highlight
-                    entity_text = text[start:end]
-                    
-                    # Create markdown-style highlighting
-                    highlighted_span = f'<span style="background-color: {color}; padding: 2px 4px; border-radius: 3px; font-weight: bold; color: black;">{entity_text}</span>'
-                    
-                    # Replace in highlighted text
-                    highlighted_text = highlighted_text[:start] + highlighted_span + highlighted_text[end:]
-            
-            return highlighted_text
-            
-    except Exception as e:
-        print(f"Error in highlighting with backend: {e}")
-        # Fallback to regex-based highlighting
-        pass
-    
-    # Fallback to regex-based highlighting
-    highlighted_text = text
-    colors = ['#ffeb3b', '#ff9800', '#f44336', '#9c27b0', '#2196f3', '#4caf50', '#ff5722', '#795548']
-    
-    for i, (pattern_name, pattern) in enumerate(HIPAA_PATTERNS.items()):
-        color = colors[i % len(colors)]
-        matches = re.finditer(pattern, highlighted_text, re.IGNORECASE)
+    spans = []
+    if entities is not None:
+        # Read each entity dict once into a (start, end, type) tuple, then walk by ascending start
+        # (stable on start, so entities starting together keep the backend's order)
+        entity_spans = sorted(
+            [(entity.get('start', 0), entity.get('end', 0), entity.get('category', 'UNKNOWN'))
+             for entity in entities],
+            key=lambda span: span[0]
+        )
         
-        # Replace matches with highlighted spans
-        offset = 0
-        for match in matches:
-            start, end = match.span()
-            start += offset
-            end += offset
-            
-            highlighted_span = f'<span style="background-color: {color}; padding: 2px 4px; border-radius: 3px; font-weight: bold; color: black;">{match.group()}</span>'
-            highlighted_text = highlighted_text[:start] + highlighted_span + highlighted_text[end:]
-            
-            # Adjust offset for HTML insertion
-            offset += len(highlighted_span) - (end - start)
+        text_length = len(text)
+        cursor = 0
+        for start, end, entity_type in entity_spans:
+            # Skip invalid spans and spans overlapping one already highlighted
+            if start < end and start >= cursor and end <= text_length:
+                # Get color based on entity type
+                spans.append([start, end, get_entity_color(entity_type)])
+                cursor = end
+        return spans
     
-    return highlighted_text
+    # Fallback to regex-based highlighting (single pass over all patterns)
+    for start, end, pattern_name in find_hipaa_spans(text):
+        spans.append([start, end, HIPAA_PATTERN_COLORS[pattern_name]])
+    return spans
 
-def get_entity_color(entity_type, colors):
+def get_entity_color(entity_type):
     """Get color for entity type"""
-    color_map = {
-        'PERSON': colors[0],      # Yellow
-        'SSN': colors[1],         # Orange
-        'PHONE_NUMBER': colors[2], # Red
-        'EMAIL_ADDRESS': colors[3], # Purple
-        'LOCATION': colors[4],    # Blue
-        'DATE_TIME': colors[5],   # Green
-        'MEDICAL_RECORD_NUMBER': colors[6], # Orange-red
-        'HEALTH_PLAN_ID': colors[7], # Brown
-        'NAME': colors[0],        # Yellow
-        'ADDRESS': colors[4],     # Blue
-        'DATE': colors[5],        # Green
-    }
-    return color_map.get(entity_type, colors[0])
+    return ENTITY_TYPE_COLORS.get(entity_type, HIGHLIGHT_PALETTE[0])
 
 # Global de-identifier instance (initialized once)
 deidentifier = None
+_deidentifier_lock = threading.Lock()
 
 def initialize_deidentifier():
-    """Initialize the HIPAA de-identifier with configuration"""
+    """Initialize the HIPAA de-identifier with configuration (thread-safe)"""
     global deidentifier
-    if deidentifier is None:
+    if deidentifier is not None:
+        return deidentifier
+    with _deidentifier_lock:
+        if deidentifier is not None:
+            return deidentifier
         try:
             # Get configuration
             config_dict = global_config.get_settings()
@@ -209,34 +286,97 @@ def initialize_deidentifier():
                 hf_model=hf_model,
                 device=device
             )
-            print("HIPAA De-identifier initialized successfully")
-        except Exception as e:
-            print(f"Error initializing de-identifier: {e}")
+            logger.info("HIPAA De-identifier initialized successfully")
+        except Exception:
+            logger.exception("Error initializing de-identifier")
             deidentifier = None
     return deidentifier
 
-def deidentify_text(text):
+# Load the models in the background at startup so the first click does not pay the cold start
+threading.Thread(target=initialize_deidentifier, daemon=True).start()
+
+# Inputs shorter than this skip the NER backend and use the regex fast path.
+# Off by default (0): the regexes miss PHI the models catch (e.g. single names),
+# so only enable it (DEID_FAST_PATH_CHARS=500) for demos where latency matters more
+DEID_FAST_PATH_CHARS = int(os.getenv("DEID_FAST_PATH_CHARS", "0"))
+
+def use_fast_path(text):
+    """Whether text is short enough to skip the NER backend"""
+    return len(text) < DEID_FAST_PATH_CHARS
+
+def _deidentify_for_cache(deid, text, spacy_model, hf_model, settings_digest):
+    """
+    Backend call whose result can be persisted by joblib.Memory
+    
+    The de-identifier itself is ignored for hashing; results are keyed on the text,
+    the model names and a digest of the settings (salt, formats) that shape the output.
     """
-    Real de-identification function using the HIPAA backend
+    result = deid.deidentify(text)
+    return tuple(result.get("entities", [])), result["text"]
+
+# Disk cache is opt-in: it stores raw notes and PHI entities at rest, so only
+# enable it (DEID_DISK_CACHE=<directory>) for demos on non-production data
+DEID_DISK_CACHE = os.getenv("DEID_DISK_CACHE")
+if DEID_DISK_CACHE and Memory is not None:
+    _cached_deidentify = Memory(DEID_DISK_CACHE, verbose=0).cache(_deidentify_for_cache, ignore=['deid'])
+else:
+    _cached_deidentify = _deidentify_for_cache
+
+# In-process LRU of backend results, keyed by a digest of the note so raw text is not
+# retained as a key; repeated clicks on the same text skip the NER pipeline
+BACKEND_MEMO_SIZE = 64
+_backend_memo = OrderedDict()
+_backend_memo_lock = threading.Lock()
+
+def _backend_run(deid, text):
+    """
+    Memoized backend call keyed on the text digest and the settings digest
+    
+    Only successful backend runs are cached; exceptions propagate uncached.
+    
+    Returns:
+        Tuple of (entities tuple, deidentified_text)
+    """
+    models = deid.config.get("models", {})
+    settings_digest = hashlib.sha256(json.dumps(deid.config, sort_keys=True, default=str).encode()).hexdigest()
+    key = (hashlib.sha256(text.encode('utf-8')).hexdigest(), settings_digest)
+    with _backend_memo_lock:
+        cached = _backend_memo.get(key)
+        if cached is not None:
+            _backend_memo.move_to_end(key)
+            return cached
+    
+    result = _cached_deidentify(deid, text, models.get("spacy"), models.get("huggingface"), settings_digest)
+    with _backend_memo_lock:
+        _backend_memo[key] = result
+        if len(_backend_memo) > BACKEND_MEMO_SIZE:
+            _backend_memo.popitem(last=False)
+    return result
+
+def run_backend_once(text):
+    """
+    Run the HIPAA backend a single time and return both of its outputs
+    
+    Returns:
+        Tuple of (entities, deidentified_text); entities is None when the
+        regex fallback was used, so highlighting falls back to regex as well
     """
     if not text:
-        return ""
+        return None, ""
+    
+    if use_fast_path(text):
+        return None, fallback_deidentify_text(text)
     
     try:
-        # Initialize de-identifier if not already done
         deid = initialize_deidentifier()
-        if deid is None:
-            # Fallback to simple regex-based de-identification
-            return fallback_deidentify_text(text)
-        
-        # Use the real HIPAA de-identifier
-        result = deid.deidentify(text)
-        return result["text"]
-        
-    except Exception as e:
-        print(f"Error in de-identification: {e}")
-        # Fallback to simple regex-based de-identification
-        return fallback_deidentify_text(text)
+        if deid is not None:
+            entities, deidentified_text = _backend_run(deid, text)
+            return list(entities), deidentified_text
+    except Exception:
+        logger.exception("Error in de-identification")
+    
+    # Fallback to simple regex-based de-identification
+    return None, fallback_deidentify_text(text)
 
 def fallback_deidentify_text(text):
     """
@@ -245,31 +385,8 @@ def fallback_deidentify_text(text):
     if not text:
         return ""
     
-    # Simple regex-based de-identification as fallback
-    deidentified = text
-    
-    # Replace names with [PATIENT NAME]
-    deidentified = re.sub(HIPAA_PATTERNS['names'], '[PATIENT NAME]', deidentified)
-    
-    # Replace SSN with [SSN]
-    deidentified = re.sub(HIPAA_PATTERNS['ssn'], '[SSN]', deidentified)
-    
-    # Replace phone with [PHONE]
-    deidentified = re.sub(HIPAA_PATTERNS['phone'], '[PHONE]', deidentified)
-    
-    # Replace email with [EMAIL]
-    deidentified = re.sub(HIPAA_PATTERNS['email'], '[EMAIL]', deidentified)
-    
-    # Replace dates with [DATE]
-    deidentified = re.sub(HIPAA_PATTERNS['dates'], '[DATE]', deidentified)
-    
-    # Replace medical record numbers
-    deidentified = re.sub(HIPAA_PATTERNS['medical_record'], 'MRN: [REDACTED]', deidentified)
-    
-    # Replace insurance policy numbers
-    deidentified = re.sub(HIPAA_PATTERNS['insurance'], 'Policy: [REDACTED]', deidentified)
-    
-    return deidentified
+    # Simple regex-based de-identification as fallback, all patterns in one pass
+    return HIPAA_FALLBACK_COMBINED.sub(lambda m: HIPAA_REPLACEMENTS[m.lastgroup], text)
 
 # Helper function to get documents from data directory
 def get_documents_structure():
@@ -279,16 +396,16 @@ def get_documents_structure():
     
     try:
         if not data_dir.exists():
-            print(f"Warning: Data directory not found at {data_dir}")
+            logger.warning("Data directory not found at %s", data_dir)
             # Try absolute path
             current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
             data_dir = current_dir / 'data'
-            print(f"Trying absolute path: {data_dir}")
+            logger.info("Trying absolute path: %s", data_dir)
             if not data_dir.exists():
-                print(f"Data directory not found at {data_dir}")
+                logger.error("Data directory not found at %s", data_dir)
                 return documents
             
-        print(f"Reading documents from: {data_dir}")
+        logger.info("Reading documents from: %s", data_dir)
         for doc_type_dir in sorted(data_dir.iterdir()):
             if doc_type_dir.is_dir():
                 doc_type = doc_type_dir.name
@@ -296,7 +413,7 @@ def get_documents_structure():
                 
                 # List all files for debugging
                 all_files = list(doc_type_dir.glob('*.*'))
-                print(f"Found {len(all_files)} files in {doc_type}: {[f.name for f in all_files]}")
+                logger.debug("Found %d files in %s: %s", len(all_files), doc_type, [f.name for f in all_files])
                 
                 for doc_file in sorted(doc_type_dir.glob('*.txt')):
                     # Clean document name
@@ -314,21 +431,19 @@ def get_documents_structure():
                 
                 if docs:
                     documents[doc_type] = docs
-                    print(f"Added {len(docs)} documents to category '{doc_type}'")
+                    logger.debug("Added %d documents to category '%s'", len(docs), doc_type)
         
-        print(f"Found {len(documents)} document categories with documents")
+        logger.info("Found %d document categories with documents", len(documents))
         # Print first few documents in each category for debugging
         for category, docs in documents.items():
-            print(f"  - {category}: {len(docs)} documents")
+            logger.debug("  - %s: %d documents", category, len(docs))
             if docs:
-                print(f"    First doc: {docs[0]['label']} -> {docs[0]['value']}")
+                logger.debug("    First doc: %s -> %s", docs[0]['label'], docs[0]['value'])
         
         return documents
         
-    except Exception as e:
-        print(f"Error loading documents: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error loading documents")
         return documents
 
 # Get documents structure
@@ -505,11 +620,9 @@ app.layout = html.Div([
             html.Div(id='progress-text', style={'textAlign': 'center', 'marginTop': '10px', 'color': HEALTHCARE_COLORS['dark']})
         ], style={'marginBottom': '30px', 'display': 'none'}, id='progress-container'),
         
-        # Hidden dcc.Store components for multi-stage processing
-        dcc.Store(id='raw-text-store', data=None),
+        # Hidden dcc.Store components holding the processing results
         dcc.Store(id='highlighted-text-store', data=None),
         dcc.Store(id='deidentified-text-store', data=None),
-        dcc.Store(id='processing-stage-store', data='idle'),  # 'idle', 'start', 'highlighting_done', 'deidentifying_done', 'complete'
         
         # Side-by-side comparison
         html.Div([
@@ -621,257 +734,192 @@ app.layout = html.Div([
     ])
 ], style={'backgroundColor': '#ffffff', 'minHeight': '100vh'})
 
-# Main callback for initiating processing and clearing
+# Default De-Identify button style (enabled)
+DEFAULT_PROCESS_BUTTON_STYLE = {
+    'backgroundColor': HEALTHCARE_COLORS['success'],
+    'color': 'white',
+    'border': 'none',
+    'padding': '12px 24px',
+    'borderRadius': '20px',
+    'cursor': 'pointer',
+    'fontSize': '16px',
+    'fontWeight': 'bold',
+    'marginTop': '15px'
+}
+
+# Disabled De-Identify button style (lighter green)
+DISABLED_PROCESS_BUTTON_STYLE = {
+    'backgroundColor': HEALTHCARE_COLORS['success_disabled'],
+    'color': 'white',
+    'border': 'none',
+    'padding': '12px 24px',
+    'borderRadius': '20px',
+    'cursor': 'not-allowed',
+    'fontSize': '16px',
+    'fontWeight': 'bold',
+    'marginTop': '15px',
+    'opacity': '0.7'
+}
+
+# Default Clear All button style (enabled)
+DEFAULT_CLEAR_BUTTON_STYLE = {
+    'backgroundColor': HEALTHCARE_COLORS['warning'],
+    'color': 'white',
+    'border': 'none',
+    'padding': '12px 24px',
+    'borderRadius': '20px',
+    'cursor': 'pointer',
+    'fontSize': '16px',
+    'fontWeight': 'bold',
+    'marginTop': '15px',
+    'marginLeft': '10px'
+}
+
+# Disabled Clear All button style (light orange)
+DISABLED_CLEAR_BUTTON_STYLE = {
+    'backgroundColor': HEALTHCARE_COLORS['warning_disabled'],
+    'color': 'white',
+    'border': 'none',
+    'padding': '12px 24px',
+    'borderRadius': '20px',
+    'cursor': 'not-allowed',
+    'fontSize': '16px',
+    'fontWeight': 'bold',
+    'marginTop': '15px',
+    'marginLeft': '10px',
+    'opacity': '0.7'
+}
+
+# Progress container styles (shown while processing, hidden after clearing)
+VISIBLE_PROGRESS_CONTAINER_STYLE = {'marginBottom': '30px', 'display': 'block'}
+HIDDEN_PROGRESS_CONTAINER_STYLE = {'display': 'none'}
+
+# Placeholder document shown in both frames after clearing
+EMPTY_FRAME_HTML = """
+    <html>
+    <body style="font-family: monospace; font-size: 14px; line-height: 1.6; padding: 15px;">
+        No data to process...
+    </body>
+    </html>
+    """
+
+# De-identified frame document, split around the body content so each request is a plain concatenation
+DEIDENTIFIED_FRAME_PREFIX = (
+    '<html><head><style>'
+    'body { font-family: monospace; font-size: 14px; line-height: 1.6; padding: 15px; white-space: pre-wrap; }'
+    '.redacted { font-weight: bold; color: #006400; }'
+    '</style></head><body>'
+)
+DEIDENTIFIED_FRAME_SUFFIX = '</body></html>'
+
+def get_progress_fill_style(width):
+    """Progress bar fill style for the given width (e.g. '60%')"""
+    return {'width': width, 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}
+
+# Callback for clearing all fields
 @app.callback(
     [Output('raw-text-input', 'value'),
      Output('highlighted-text-frame', 'srcDoc', allow_duplicate=True),
      Output('deidentified-text-frame', 'srcDoc', allow_duplicate=True),
-     Output('progress-container', 'style'),
+     Output('progress-container', 'style', allow_duplicate=True),
      Output('progress-bar-fill', 'style', allow_duplicate=True),
-     Output('progress-text', 'children', allow_duplicate=True),
-     Output('raw-text-store', 'data'),
-     Output('processing-stage-store', 'data', allow_duplicate=True),
-     Output('process-btn', 'disabled'),
-     Output('process-btn', 'style'),
-     Output('clear-btn', 'disabled'),
-     Output('clear-btn', 'style')],
-    [Input('process-btn', 'n_clicks'),
-     Input('clear-btn', 'n_clicks')],
-    [State('raw-text-input', 'value')],
+     Output('progress-text', 'children', allow_duplicate=True)],
+    [Input('clear-btn', 'n_clicks')],
     prevent_initial_call=True
 )
-def handle_processing_and_clear(process_clicks, clear_clicks, raw_text):
-    # Get the callback context to determine which button was clicked
-    ctx = dash.callback_context
-    
-    if not ctx.triggered:
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
-    
-    # Get the button that was clicked
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    
-    # Default De-Identify button style (enabled)
-    default_process_button_style = {
-        'backgroundColor': HEALTHCARE_COLORS['success'],
-        'color': 'white',
-        'border': 'none',
-        'padding': '12px 24px',
-        'borderRadius': '20px',
-        'cursor': 'pointer',
-        'fontSize': '16px',
-        'fontWeight': 'bold',
-        'marginTop': '15px'
-    }
-    
-    # Disabled De-Identify button style (lighter green)
-    disabled_process_button_style = {
-        'backgroundColor': HEALTHCARE_COLORS['success_disabled'],
-        'color': 'white',
-        'border': 'none',
-        'padding': '12px 24px',
-        'borderRadius': '20px',
-        'cursor': 'not-allowed',
-        'fontSize': '16px',
-        'fontWeight': 'bold',
-        'marginTop': '15px',
-        'opacity': '0.7'
-    }
+def handle_clear(clear_clicks):
+    if not clear_clicks:
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
     
-    # Default Clear All button style (enabled)
-    default_clear_button_style = {
-        'backgroundColor': HEALTHCARE_COLORS['warning'],
-        'color': 'white',
-        'border': 'none',
-        'padding': '12px 24px',
-        'borderRadius': '20px',
-        'cursor': 'pointer',
-        'fontSize': '16px',
-        'fontWeight': 'bold',
-        'marginTop': '15px',
-        'marginLeft': '10px'
-    }
-    
-    # Disabled Clear All button style (light orange)
-    disabled_clear_button_style = {
-        'backgroundColor': HEALTHCARE_COLORS['warning_disabled'],
-        'color': 'white',
-        'border': 'none',
-        'padding': '12px 24px',
-        'borderRadius': '20px',
-        'cursor': 'not-allowed',
-        'fontSize': '16px',
-        'fontWeight': 'bold',
-        'marginTop': '15px',
-        'marginLeft': '10px',
-        'opacity': '0.7'
-    }
-    
-    if button_id == 'clear-btn' and clear_clicks:
-        # Clear all fields and re-enable both buttons
-        empty_html = """
-        <html>
-        <body style="font-family: monospace; font-size: 14px; line-height: 1.6; padding: 15px;">
-            No data to process...
-        </body>
-        </html>
-        """
-        return "", empty_html, empty_html, {'display': 'none'}, {'width': '0%', 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}, "", None, 'idle', False, default_process_button_style, False, default_clear_button_style
-    
-    elif button_id == 'process-btn' and process_clicks and raw_text:
-        # Show processing status and progress bar immediately
-        # Disable both buttons during processing
-        status = html.Div([
-            html.Span("Processing...", style={'color': HEALTHCARE_COLORS['warning'], 'fontWeight': 'bold'})
-        ])
-        
-        # Show progress bar with initial state
-        progress_style = {'marginBottom': '30px', 'display': 'block'}
-        progress_fill_style = {'width': '20%', 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}
-        progress_text = "Initializing de-identification process..."
-        
-        # Store raw text and trigger next stage, disable both buttons
-        return dash.no_update, dash.no_update, dash.no_update, progress_style, progress_fill_style, progress_text, raw_text, 'start', True, disabled_process_button_style, True, disabled_clear_button_style
-    
-    return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    # Clear all fields
+    return "", EMPTY_FRAME_HTML, EMPTY_FRAME_HTML, HIDDEN_PROGRESS_CONTAINER_STYLE, get_progress_fill_style('0%'), ""
 
-# Callback for highlighting stage
-@app.callback(
-    [Output('highlighted-text-store', 'data'),
-     Output('processing-stage-store', 'data', allow_duplicate=True),
+# Clientside callback showing the progress bar and disabling both buttons as soon as
+# De-Identify is clicked, while process_text runs on the server
+app.clientside_callback(
+    """
+    function(n_clicks, raw_text) {
+        if (!n_clicks || !raw_text) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+        return [%s, %s, "Detecting HIPAA identifiers...", %s, true, %s, true, %s];
+    }
+    """ % (
+        json.dumps(VISIBLE_PROGRESS_CONTAINER_STYLE),
+        json.dumps(get_progress_fill_style('60%')),
+        json.dumps({
+            'namespace': 'dash_html_components', 'type': 'Span',
+            'props': {'children': 'Processing...', 'style': {'color': HEALTHCARE_COLORS['warning'], 'fontWeight': 'bold'}}
+        }),
+        json.dumps(DISABLED_PROCESS_BUTTON_STYLE),
+        json.dumps(DISABLED_CLEAR_BUTTON_STYLE)
+    ),
+    [Output('progress-container', 'style', allow_duplicate=True),
      Output('progress-bar-fill', 'style', allow_duplicate=True),
-     Output('progress-text', 'children', allow_duplicate=True)],
-    [Input('raw-text-store', 'data')],
-    [State('processing-stage-store', 'data')],
+     Output('progress-text', 'children', allow_duplicate=True),
+     Output('processing-status', 'children', allow_duplicate=True),
+     Output('process-btn', 'disabled', allow_duplicate=True),
+     Output('process-btn', 'style', allow_duplicate=True),
+     Output('clear-btn', 'disabled', allow_duplicate=True),
+     Output('clear-btn', 'style', allow_duplicate=True)],
+    [Input('process-btn', 'n_clicks')],
+    [State('raw-text-input', 'value')],
     prevent_initial_call=True
 )
-def process_highlighting(raw_text, current_stage):
-    if raw_text and current_stage == 'start':
-        # Update progress to 60%
-        progress_fill_style = {'width': '60%', 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}
-        progress_text = "Detecting HIPAA identifiers..."
-        
-        # Perform highlighting
-        highlighted_html = highlight_hipaa_identifiers(raw_text)
-        
-        # Create complete HTML document
-        highlighted_complete_html = f"""
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: monospace;
-                    font-size: 14px;
-                    line-height: 1.6;
-                    padding: 15px;
-                    white-space: pre-wrap;
-                }}
-            </style>
-        </head>
-        <body>
-            {highlighted_html}
-        </body>
-        </html>
-        """
-        
-        return highlighted_complete_html, 'highlighting_done', progress_fill_style, progress_text
-    
-    return dash.no_update, dash.no_update, dash.no_update, dash.no_update
 
-# Callback for de-identification stage
+# Callback running the whole pipeline (detect, highlight, de-identify) in one request;
+# it runs in the server process, so the warmed-up models and the result memo are reused
 @app.callback(
-    [Output('deidentified-text-store', 'data'),
-     Output('processing-stage-store', 'data', allow_duplicate=True),
+    [Output('highlighted-text-store', 'data'),
+     Output('deidentified-text-store', 'data'),
      Output('progress-bar-fill', 'style', allow_duplicate=True),
      Output('progress-text', 'children', allow_duplicate=True),
+     Output('processing-status', 'children', allow_duplicate=True),
      Output('process-btn', 'disabled', allow_duplicate=True),
      Output('process-btn', 'style', allow_duplicate=True),
      Output('clear-btn', 'disabled', allow_duplicate=True),
      Output('clear-btn', 'style', allow_duplicate=True)],
-    [Input('highlighted-text-store', 'data')],
-    [State('processing-stage-store', 'data'),
-     State('raw-text-store', 'data')],
+    [Input('process-btn', 'n_clicks')],
+    [State('raw-text-input', 'value')],
     prevent_initial_call=True
 )
-def process_deidentification(highlighted_data, current_stage, raw_text):
-    if highlighted_data and current_stage == 'highlighting_done' and raw_text:
-        # Update progress to 80%
-        progress_fill_style = {'width': '80%', 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}
-        progress_text = "Applying de-identification rules..."
-        
-        # Perform de-identification
-        deidentified_text = deidentify_text(raw_text)
-        
-        # Format de-identified text
-        formatted_deidentified = format_deidentified_text(raw_text, deidentified_text)
-        
-        # Create complete HTML document
-        deidentified_complete_html = f"""
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: monospace;
-                    font-size: 14px;
-                    line-height: 1.6;
-                    padding: 15px;
-                    white-space: pre-wrap;
-                }}
-                .redacted {{
-                    font-weight: bold;
-                    color: #006400;
-                }}
-            </style>
-        </head>
-        <body>
-            {formatted_deidentified}
-        </body>
-        </html>
-        """
-        
-        # Update progress to 100%
-        progress_fill_style = {'width': '100%', 'height': '100%', 'backgroundColor': HEALTHCARE_COLORS['success'], 'borderRadius': '10px', 'transition': 'width 0.3s ease'}
-        progress_text = "Processing complete!"
-        
-        # Re-enable both buttons with default styling
-        default_process_button_style = {
-            'backgroundColor': HEALTHCARE_COLORS['success'],
-            'color': 'white',
-            'border': 'none',
-            'padding': '12px 24px',
-            'borderRadius': '20px',
-            'cursor': 'pointer',
-            'fontSize': '16px',
-            'fontWeight': 'bold',
-            'marginTop': '15px'
-        }
-        
-        default_clear_button_style = {
-            'backgroundColor': HEALTHCARE_COLORS['warning'],
-            'color': 'white',
-            'border': 'none',
-            'padding': '12px 24px',
-            'borderRadius': '20px',
-            'cursor': 'pointer',
-            'fontSize': '16px',
-            'fontWeight': 'bold',
-            'marginTop': '15px',
-            'marginLeft': '10px'
-        }
-        
-        return deidentified_complete_html, 'complete', progress_fill_style, progress_text, False, default_process_button_style, False, default_clear_button_style
+def process_text(process_clicks, raw_text):
+    if not process_clicks or not raw_text:
+        raise dash.exceptions.PreventUpdate
+    
+    # Run the backend once; entities drive highlighting and the text drives the right pane
+    entities, deidentified_text = run_backend_once(raw_text)
+    
+    # Only the raw text and compact spans are sent; the browser builds the HTML
+    highlighted_data = {
+        'text': raw_text,
+        'entities': get_highlight_spans(raw_text, entities)
+    }
+    
+    # Format de-identified text
+    formatted_deidentified = format_deidentified_text(raw_text, deidentified_text)
+    
+    # Create complete HTML document
+    deidentified_complete_html = DEIDENTIFIED_FRAME_PREFIX + formatted_deidentified + DEIDENTIFIED_FRAME_SUFFIX
     
-    return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    processing_status = html.Div([
+        html.Span("Processing Complete", style={'color': HEALTHCARE_COLORS['success'], 'fontWeight': 'bold'})
+    ])
+    
+    # Finish the progress bar and re-enable both buttons
+    return (
+        highlighted_data, deidentified_complete_html,
+        get_progress_fill_style('100%'), "Processing complete!", processing_status,
+        False, DEFAULT_PROCESS_BUTTON_STYLE, False, DEFAULT_CLEAR_BUTTON_STYLE
+    )
 
-# Callback to update highlighted text display
-@app.callback(
+# Clientside callback to render the highlighted text display (assets/highlight.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='highlight', function_name='render'),
     Output('highlighted-text-frame', 'srcDoc', allow_duplicate=True),
     [Input('highlighted-text-store', 'data')],
     prevent_initial_call=True
 )
-def update_highlighted_display(highlighted_data):
-    if highlighted_data:
-        return highlighted_data
-    return dash.no_update
 
 # Callback to update de-identified text display
 @app.callback(
@@ -884,40 +932,81 @@ def update_deidentified_display(deidentified_data):
         return deidentified_data
     return dash.no_update
 
-# Callback to update processing status
-@app.callback(
-    Output('processing-status', 'children'),
-    [Input('processing-stage-store', 'data')],
-    prevent_initial_call=True
-)
-def update_processing_status(stage):
-    if stage == 'complete':
-        return html.Div([
-            html.Span("Processing Complete", style={'color': HEALTHCARE_COLORS['success'], 'fontWeight': 'bold'})
-        ])
-    elif stage in ['start', 'highlighting_done', 'deidentifying_done']:
-        return html.Div([
-            html.Span("Processing...", style={'color': HEALTHCARE_COLORS['warning'], 'fontWeight': 'bold'})
-        ])
-    return dash.no_update
+# Redaction markers like [REDACTED:TYPE], the fallback tokens and PERSON_ pseudonyms
+REDACTED_PATTERN = re.compile(r'\[(?:REDACTED:[A-Z_]+|DATE|PATIENT NAME|SSN|PHONE|EMAIL)\]|PERSON_[a-z0-9]+')
 
 def format_deidentified_text(original_text, deidentified_text):
     """
     Format de-identified text to match the structure of the original text
     and highlight the redacted parts in bold
     """
-    # Find all redacted patterns like [REDACTED:TYPE]
-    redacted_pattern = r'\[REDACTED:[A-Z_]+\]|\[DATE\]|\[PATIENT NAME\]|\[SSN\]|\[PHONE\]|\[EMAIL\]|PERSON_[a-z0-9]+'
-    
-    # Bold all redacted text
-    formatted_text = re.sub(
-        redacted_pattern,
-        r'<span class="redacted">\g<0></span>',
-        deidentified_text
-    )
+    # Bold all redacted text in a single pass
+    # Escape first so note content cannot inject markup into the frame
+    formatted_text = REDACTED_PATTERN.sub(r'<span class="redacted">\g<0></span>', escape(deidentified_text))
     
     return formatted_text
 
+class FrameTextExtractor(HTMLParser):
+    """Collect the visible text of a frame document in one pass, skipping <style>/<script> content"""
+    
+    def __init__(self, out=None):
+        super().__init__(convert_charrefs=True)
+        # Text stream the visible text is written to as it is parsed
+        self.out = out if out is not None else io.StringIO()
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ('style', 'script'):
+            self._skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in ('style', 'script') and self._skip_depth:
+            self._skip_depth -= 1
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.out.write(data)
+
+def extract_frame_text(document, out=None):
+    """
+    Extract the plain text of an HTML frame document (tags removed, entities unescaped)
+    
+    Args:
+        document: HTML document to extract from
+        out: Optional text stream to write the text into instead of returning it
+        
+    Returns:
+        The extracted text, or None when it was written to out
+    """
+    extractor = FrameTextExtractor(out)
+    extractor.feed(document)
+    extractor.close()
+    if out is None:
+        return extractor.out.getvalue()
+    return None
+
+@functools.lru_cache(maxsize=32)
+def count_hipaa_identifiers(raw_text):
+    """
+    Count HIPAA pattern matches in the text, memoized so repeated statistics clicks
+    on unchanged text skip the scan
+    
+    Returns:
+        Tuple of (pattern_name, count) pairs for the patterns that matched
+    """
+    stats = []
+    lowered_text = raw_text.lower()
+    for pattern_name, pattern in HIPAA_COMPILED.items():
+        # Skip the regex scan when the pattern's required literal is not in the text
+        keyword = HIPAA_PATTERN_KEYWORDS.get(pattern_name)
+        if keyword is not None and keyword not in lowered_text:
+            continue
+        # Count matches without materializing the matched strings
+        matches = sum(1 for _ in pattern.finditer(raw_text))
+        if matches > 0:
+            stats.append((pattern_name, matches))
+    return tuple(stats)
+
 # Callback for statistics
 @app.callback(
     Output('statistics-display', 'children'),
@@ -930,11 +1019,7 @@ def show_statistics(n_clicks, raw_text):
         return ""
     
     # Count HIPAA identifiers
-    stats = {}
-    for pattern_name, pattern in HIPAA_PATTERNS.items():
-        matches = len(re.findall(pattern, raw_text, re.IGNORECASE))
-        if matches > 0:
-            stats[pattern_name] = matches
+    stats = dict(count_hipaa_identifiers(raw_text))
     
     if not stats:
         return html.Div([
@@ -980,26 +1065,19 @@ def show_statistics(n_clicks, raw_text):
 def export_results(n_clicks, raw_text, deidentified_text):
     if n_clicks and raw_text and deidentified_text:
         # Create downloadable content
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"deid_results_{timestamp}.txt"
         
-        # Extract text content from HTML
-        import re
-        # Remove HTML tags to get clean text
-        clean_text = re.sub(r'<[^>]+>', '', deidentified_text)
-        
-        content = f"""
-DEID Patients - De-identification Results
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-ORIGINAL DATA:
-{raw_text}
-
-DE-IDENTIFIED DATA:
-{clean_text}
-
-HIPAA Compliance: ✅ Verified
-"""
+        # Assemble the report in a buffer; the frame text is parsed straight into it
+        buf = io.StringIO()
+        buf.write("\nDEID Patients - De-identification Results\n")
+        buf.write(f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\nORIGINAL DATA:\n")
+        buf.write(raw_text)
+        buf.write("\n\nDE-IDENTIFIED DATA:\n")
+        extract_frame_text(deidentified_text, buf)
+        buf.write("\n\nHIPAA Compliance: ✅ Verified\n")
+        content = buf.getvalue()
         
         # In a real implementation, you would create a download link here
         return "Export Complete"
@@ -1017,9 +1095,9 @@ def update_document_names(selected_type):
     if selected_type and selected_type in DOCUMENTS:
         # Debug print to check what's happening
         options = [{'label': doc['label'], 'value': doc['value']} for doc in DOCUMENTS[selected_type]]
-        print(f"Generated {len(options)} document options for {selected_type}")
+        logger.debug("Generated %d document options for %s", len(options), selected_type)
         for opt in options[:3]:  # Print first few for debugging
-            print(f"  - Option: {opt['label']} -> {opt['value']}")
+            logger.debug("  - Option: %s -> %s", opt['label'], opt['value'])
         return options, None  # Reset the value when type changes
     return [], None
 
@@ -1042,21 +1120,19 @@ def load_document_content(selected_file_path):
     
     if selected_file_path:
         try:
-            print(f"Attempting to load document: {selected_file_path}")
+            logger.debug("Attempting to load document: %s", selected_file_path)
             # Read the file
             file_path = Path(selected_file_path)
             if file_path.exists():
                 with open(file_path, 'r', encoding='utf-8') as file:
                     content = file.read()
-                print(f"Successfully loaded document: {file_path.name}")
+                logger.info("Successfully loaded document: %s", file_path.name)
                 return content
             else:
-                print(f"File not found: {file_path}")
+                logger.warning("File not found: %s", file_path)
                 return dash.no_update
-        except Exception as e:
-            print(f"Error loading document: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error loading document")
             return dash.no_update
     
     return dash.no_update
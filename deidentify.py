@@ -6,10 +6,11 @@ This script demonstrates the de-identification of Protected Health Information (
 in medical text according to HIPAA Safe Harbor guidelines and the configuration.
 """
 
+import argparse
 import os
 import sys
-import json
-from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
+
+from hipaa_deidentifier.utils.json_output import json_line, write_json
 
 # Configuration is handled centrally without environment variables
 
@@ -27,11 +28,105 @@ Labs: A1c 7.2%, LDL 145, HDL 42
 Prescribed metformin 500mg BID
 """
 
+# Stream mode settings: characters read per file read, the largest block sent to the
+# models at once, and blocks per batched call
+STREAM_READ_SIZE = 65536
+STREAM_MAX_BLOCK_CHARS = 262144
+STREAM_BATCH_BLOCKS = 8
+
+
+def _block_end(buffer, max_chars):
+    """
+    Returns the length of the next complete block at the start of buffer.
+    
+    A block ends at the last blank line within max_chars; past the cap with no
+    blank line, it ends at the last newline before the cap (or at the cap itself).
+    
+    Args:
+        buffer: Text read but not yet yielded
+        max_chars: Maximum number of characters per block
+        
+    Returns:
+        The block length, or 0 if more input is needed
+    """
+    window = buffer[:max_chars]
+    cut = window.rfind("\n\n")
+    if cut != -1:
+        return cut + 2
+    if len(buffer) < max_chars:
+        return 0
+    return window.rfind("\n") + 1 or max_chars
+
+
+def iter_text_blocks(input_file, read_size=STREAM_READ_SIZE, max_chars=STREAM_MAX_BLOCK_CHARS):
+    """
+    Yields (offset, block) pairs from a text file without reading it whole.
+    
+    Blocks end at blank lines so paragraphs are kept together, but never grow past
+    max_chars, so a file without blank lines is still streamed.
+    
+    Args:
+        input_file: Open text file to read from
+        read_size: Number of characters per read
+        max_chars: Maximum number of characters per block
+        
+    Returns:
+        Iterator of (character offset of the block in the file, block text)
+    """
+    buffer = ""
+    offset = 0
+    for piece in iter(lambda: input_file.read(read_size), ""):
+        buffer += piece
+        cut = _block_end(buffer, max_chars)
+        while cut:
+            yield offset, buffer[:cut]
+            offset += cut
+            buffer = buffer[cut:]
+            cut = _block_end(buffer, max_chars)
+    if buffer:
+        yield offset, buffer
+
+
+def write_block_results(deidentifier, blocks, output_file):
+    """
+    De-identifies a batch of (offset, block) pairs and appends one JSON line per block.
+    
+    Args:
+        deidentifier: The de-identifier to use
+        blocks: List of (offset, block text) pairs
+        output_file: Open text file to write NDJSON results to
+    """
+    results = deidentifier.deidentify_batch([block for _, block in blocks])
+    for (offset, _), result in zip(blocks, results):
+        output_file.write(json_line({"offset": offset, **result}))
+        output_file.write("\n")
+    output_file.flush()
+
+
+# Validate the command line before importing the models, so bad arguments fail fast
+parser = argparse.ArgumentParser(description="De-identify PHI in medical text.")
+parser.add_argument("--device", type=int, help="GPU index to run the HF model on in fp16, or -1 for CPU")
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument("--stream", nargs=2, metavar=("INPUT", "OUTPUT"),
+                  help="De-identify a large file block by block, writing NDJSON results to OUTPUT")
+mode.add_argument("--server", action="store_true",
+                  help="Read one file path per stdin line and write one JSON result per stdout line")
+args = parser.parse_args()
+
+if args.stream and not os.path.isfile(args.stream[0]):
+    parser.error(f"Input file not found: {args.stream[0]}")
+
+# Keep stdout pure NDJSON in server mode; stream mode reports on stderr as well
+log_file = sys.stderr if args.server or args.stream else sys.stdout
+
+# Deferred: these pull in spaCy, Presidio, torch and transformers
+from config.config import config as global_config
+from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
+
 # Initialize the de-identifier with config file
 config_path = "config/main.yaml"
 
 # Load configuration directly
-from config.config import config as global_config
 config_dict = global_config.get_settings()
 
 # Get model names from configuration
@@ -39,32 +134,69 @@ spacy_model = config_dict.get("models", {}).get("spacy")
 hf_model = config_dict.get("models", {}).get("huggingface")
 device = config_dict.get("models", {}).get("device", -1)
 
+# --device N overrides the configured device; on a GPU the HF model runs in fp16
+use_fp16 = None
+if args.device is not None:
+    device = args.device
+    if device >= 0:
+        use_fp16 = True
+
 # Print what models we're using
-print(f"Using spaCy model: {spacy_model}")
-print(f"Using HF model: {hf_model}")
+print(f"Using spaCy model: {spacy_model}", file=log_file)
+print(f"Using HF model: {hf_model}", file=log_file)
+print(f"Using device: {device}", file=log_file)
 
 # Initialize the deidentifier with the configured models
 deidentifier = HIPAADeidentifierModular(
     config_path=config_path,
     spacy_model=spacy_model,
     hf_model=hf_model,
-    device=device
+    device=device,
+    use_fp16=use_fp16
 )
 
-# Process the text
-print(f"Processing {len(sample_text)} characters of text...")
-result = deidentifier.deidentify(sample_text)
+# Server mode: keep the loaded models and de-identify one file path per stdin line,
+# writing one JSON result per line (e.g. `ls notes/*.txt | python deidentify.py --server`)
+if args.server:
+    for line in sys.stdin:
+        path = line.strip()
+        if not path:
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = deidentifier.deidentify(f.read())
+            print(json_line({"path": path, **result}), flush=True)
+        except Exception as e:
+            print(json_line({"path": path, "error": str(e)}), flush=True)
+elif args.stream:
+    # Stream mode: de-identify a large file block by block, writing one JSON result per block
+    # as soon as its batch is done; entity offsets are relative to the block's "offset"
+    # (e.g. `python deidentify.py --stream notes.txt notes.ndjson`)
+    input_path, output_path = args.stream
+    with open(input_path, "r", encoding="utf-8") as input_file, open(output_path, "w", encoding="utf-8") as output_file:
+        batch = []
+        for block in iter_text_blocks(input_file):
+            batch.append(block)
+            if len(batch) == STREAM_BATCH_BLOCKS:
+                write_block_results(deidentifier, batch, output_file)
+                batch = []
+        if batch:
+            write_block_results(deidentifier, batch, output_file)
+    print(f"Results streamed to {output_path}", file=log_file)
+else:
+    # Process the text
+    print(f"Processing {len(sample_text)} characters of text...")
+    result = deidentifier.deidentify(sample_text)
 
-# Print the results
-print("\nDe-identified text:")
-print(result["text"])
+    # Print the results
+    print("\nDe-identified text:")
+    print(result["text"])
 
-print("\nDetected entities:")
-for entity in result["entities"]:
-    print(f"  - {entity['category']} at positions {entity['start']}:{entity['end']} (confidence: {entity['confidence']})")
+    print("\nDetected entities:")
+    for entity in result["entities"]:
+        print(f"  - {entity['category']} at positions {entity['start']}:{entity['end']} (confidence: {entity['confidence']})")
 
-# Save the results to a file
-with open("deidentified_output.json", "w", encoding="utf-8") as f:
-    json.dump(result, f, ensure_ascii=False, indent=2)
+    # Save the results to a file
+    write_json("deidentified_output.json", result)
 
-print("\nResults saved to deidentified_output.json")
\ No newline at end of file
+    print("\nResults saved to deidentified_output.json")
\ No newline at end of file
@@ -10,6 +10,7 @@ consistent date shifting, and numeric guards for labs and vitals.
 import json
 import os
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tabulate import tabulate
 from hipaa_deidentifier.deidentifier import HIPAADeidentifier
@@ -130,10 +131,7 @@ NPI: 1234567890
         print("-" * 80)
         
         # Count identifiers by category
-        categories = {}
-        for entity in result["entities"]:
-            cat = entity["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(entity["category"] for entity in result["entities"])
         
         # Display category counts
         print(f"\nDETECTED PHI CATEGORIES:")
@@ -6,12 +6,14 @@ This example demonstrates the de-identification of a clinical note
 with special attention to preserving clinical terms and medication doses.
 """
 
-import json
+import logging
 import os
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tabulate import tabulate
-from hipaa_deidentifier.deidentifier import HIPAADeidentifier
+from hipaa_deidentifier.utils.json_output import write_json
+
+logger = logging.getLogger(__name__)
 
 def main():
     """Run clinical note de-identification test."""
@@ -60,8 +62,13 @@ def main():
     print("-" * 80)
     
     try:
+        # Deferred: only needed once there are results to display
+        from tabulate import tabulate
+        
         # Initialize the de-identifier
         print("\nInitializing HIPAA de-identifier...")
+        # Deferred: pulls in spaCy, Presidio, torch and transformers
+        from hipaa_deidentifier.deidentifier import HIPAADeidentifier
         deidentifier = HIPAADeidentifier(
             config_path="config/main.yaml",
             spacy_model="en_core_web_lg",
@@ -82,10 +89,7 @@ def main():
         print("-" * 80)
         
         # Count identifiers by category
-        categories = {}
-        for entity in result["entities"]:
-            cat = entity["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(entity["category"] for entity in result["entities"])
         
         # Display category counts
         print(f"\nDETECTED PHI CATEGORIES:")
@@ -108,22 +112,13 @@ def main():
         original_lines = sample_text.strip().split('\n')
         deidentified_lines = result["text"].strip().split('\n')
         
-        # Create a table with before/after comparisons
+        # Create a table with before/after comparisons (zip stops at the shorter text)
         comparison_table = []
-        
-        # Make sure we have the same number of lines to compare
-        min_lines = min(len(original_lines), len(deidentified_lines))
-        
-        for i in range(min_lines):
-            # Skip empty lines
-            if not original_lines[i].strip():
-                continue
-                
-            comparison_table.append([
-                i+1,  # Line number
-                original_lines[i].strip(),
-                deidentified_lines[i].strip()
-            ])
+        for i, (original, deidentified) in enumerate(zip(original_lines, deidentified_lines), start=1):
+            # Strip once and skip empty lines
+            original = original.strip()
+            if original:
+                comparison_table.append([i, original, deidentified.strip()])
         
         print(tabulate(
             comparison_table,
@@ -134,17 +129,14 @@ def main():
         
         # Save results
         output_file = "examples/clinical_note_test_output.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(output_file, result)
         print(f"\n✅ Results saved to: {output_file}")
         
         print(f"\n🎉 Clinical note de-identification test completed successfully!")
         print(f"✅ Detected {len(result['entities'])} PHI entities across {len(categories)} categories")
         
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error: %s", e)
         return False
     
     return True
@@ -11,6 +11,7 @@ import json
 import time
 import os
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tabulate import tabulate
 from hipaa_deidentifier.deidentifier import HIPAADeidentifier
@@ -101,10 +102,7 @@ def main():
         print(f"Processing speed: {len(sample_text)/avg_time:.0f} chars/sec")
         
         # Count entities by category
-        categories = {}
-        for entity in result["entities"]:
-            cat = entity["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(entity["category"] for entity in result["entities"])
         
         print(f"\nPHI CATEGORIES DETECTED:")
         print("-" * 40)
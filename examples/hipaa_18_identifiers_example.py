@@ -8,11 +8,17 @@ and transform all 18 HIPAA Safe Harbor identifiers as required for HIPAA complia
 
 import json
 import os
+import re
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tabulate import tabulate
 from hipaa_deidentifier.deidentifier import HIPAADeidentifier
 
+# Patterns used to locate transformed values in the de-identified text
+NAME_TOKEN_RE = re.compile(r"PATIENT_[a-f0-9_]+")
+MRN_TOKEN_RE = re.compile(r"MRN_[a-f0-9_-]+")
+
 def main():
     """Run HIPAA 18 identifiers example."""
     print("=" * 80)
@@ -76,10 +82,7 @@ def main():
         print("-" * 80)
         
         # Count identifiers by category
-        categories = {}
-        for entity in result["entities"]:
-            cat = entity["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(entity["category"] for entity in result["entities"])
         
         # Display category counts
         print(f"\nDETECTED PHI CATEGORIES:")
@@ -130,19 +133,24 @@ def main():
         print(f"\nTRANSFORMATION EXAMPLES (ONE PER CATEGORY):")
         print("-" * 80)
         
-        # Group entities by category
-        from collections import defaultdict
-        entities_by_category = defaultdict(list)
-        
+        # Pick the best example per category in one pass: the longest of its first
+        # three entities (prefer longer text for clarity), earliest on ties
+        best_by_category = {}  # category -> [entities considered, best length, best entity]
         for entity in result["entities"]:
-            entities_by_category[entity["category"]].append(entity)
+            length = entity["end"] - entity["start"]
+            best = best_by_category.get(entity["category"])
+            if best is None:
+                best_by_category[entity["category"]] = [1, length, entity]
+            elif best[0] < 3:
+                best[0] += 1
+                if length > best[1]:
+                    best[1], best[2] = length, entity
             
         # Show one clear example per category
         examples_table = []
         
-        for category, entities in sorted(entities_by_category.items()):
-            # Find the best example (prefer longer text for clarity)
-            best_entity = max(entities[:3], key=lambda e: len(sample_text[e["start"]:e["end"]]))
+        for category in sorted(best_by_category):
+            best_entity = best_by_category[category][2]
             
             # Get the original text
             original = sample_text[best_entity["start"]:best_entity["end"]]
@@ -150,15 +158,12 @@ def main():
             # Determine the transformation pattern
             if category == "NAME":
                 # Look for actual transformation in result text
-                name_pattern = r"PATIENT_[a-f0-9_]+"
-                import re
-                
                 # Search around the entity position
                 start_search = max(0, best_entity["start"] - 50)
                 end_search = min(len(result["text"]), best_entity["end"] + 50)
                 search_area = result["text"][start_search:end_search]
                 
-                matches = re.findall(name_pattern, search_area)
+                matches = NAME_TOKEN_RE.findall(search_area)
                 transformed = matches[0] if matches else "[REDACTED:NAME]"
             elif category == "DATE":
                 transformed = "[REDACTED-DATE]"
@@ -166,15 +171,12 @@ def main():
                 transformed = "[GENERALIZED:LOCATION]"
             elif category == "MRN":
                 # Look for actual transformation in result text
-                mrn_pattern = r"MRN_[a-f0-9_-]+"
-                import re
-                
                 # Search around the entity position
                 start_search = max(0, best_entity["start"] - 50)
                 end_search = min(len(result["text"]), best_entity["end"] + 50)
                 search_area = result["text"][start_search:end_search]
                 
-                matches = re.findall(mrn_pattern, search_area)
+                matches = MRN_TOKEN_RE.findall(search_area)
                 transformed = matches[0] if matches else "[REDACTED:MRN]"
             else:
                 transformed = f"[REDACTED:{category}]"
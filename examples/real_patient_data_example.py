@@ -7,12 +7,14 @@ from the data/patient_details.txt file, showing how the system handles
 complex medical records with multiple PHI types.
 """
 
-import json
+import logging
 import os
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tabulate import tabulate
-from hipaa_deidentifier.deidentifier import HIPAADeidentifier
+from hipaa_deidentifier.utils.json_output import write_json
+
+logger = logging.getLogger(__name__)
 
 def main():
     """Run real patient data deidentification example."""
@@ -31,6 +33,9 @@ def main():
             patient_text = f.read()
         print(f"✅ Loaded {len(patient_text)} characters of patient data")
         
+        # Deferred until the input exists, so a missing file fails fast
+        from tabulate import tabulate
+        
         # Show sample of original text
         print(f"\nSAMPLE OF ORIGINAL PATIENT DATA:")
         print("-" * 80)
@@ -39,6 +44,8 @@ def main():
         
         # Initialize the de-identifier
         print("\nInitializing HIPAA de-identifier...")
+        # Deferred: pulls in spaCy, Presidio, torch and transformers
+        from hipaa_deidentifier.deidentifier import HIPAADeidentifier
         deidentifier = HIPAADeidentifier(
             config_path="config/main.yaml",
             spacy_model="en_core_web_lg",
@@ -59,10 +66,7 @@ def main():
         print(f"Total PHI entities detected: {len(result['entities'])}")
         
         # Count entities by category
-        categories = {}
-        for entity in result["entities"]:
-            cat = entity["category"]
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(entity["category"] for entity in result["entities"])
         
         print(f"\nPHI CATEGORIES DETECTED:")
         print("-" * 40)
@@ -87,14 +91,18 @@ def main():
         print("-" * 80)
         entities_table = []
         for entity in result["entities"][:20]:  # Show first 20 entities
-            start_idx = max(0, entity["start"] - 10)
-            end_idx = min(len(patient_text), entity["end"] + 10)
-            context = f"...{patient_text[start_idx:entity['start']]}<{patient_text[entity['start']:entity['end']]}>{patient_text[entity['end']:end_idx]}..."
+            start, end = entity["start"], entity["end"]
+            start_idx = max(0, start - 10)
+            
+            # Slice the context window once and mark the entity inside it
+            window = patient_text[start_idx:end + 10]
+            left, right = start - start_idx, end - start_idx
+            context = "".join(("...", window[:left], "<", window[left:right], ">", window[right:], "..."))
             
             entities_table.append([
                 entity["category"],
-                entity["start"],
-                entity["end"],
+                start,
+                end,
                 round(entity["confidence"], 2),
                 context
             ])
@@ -110,8 +118,7 @@ def main():
         
         # Save results
         output_file = "examples/real_patient_data_output.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(output_file, result)
         print(f"\n✅ Full results saved to: {output_file}")
         
         print(f"\n🎉 Real patient data deidentification example completed successfully!")
@@ -123,9 +130,7 @@ def main():
         print("Please ensure the patient data file exists in the data/ directory")
         return False
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error: %s", e)
         return False
     
     return True
@@ -18,16 +18,18 @@ Version: 1.0.0
 
 import os
 import sys
-import json
 import random
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+from hipaa_deidentifier.utils.json_output import write_json
 
-from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
+if TYPE_CHECKING:
+    from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
 
 
 def get_random_patient_file() -> str:
@@ -39,18 +41,24 @@ def get_random_patient_file() -> str:
     """
     data_dir = project_root / "data"
     
-    # Get all text files from all subdirectories
-    patient_files = []
-    for root, dirs, files in os.walk(data_dir):
-        for file in files:
-            if file.endswith('.txt'):
-                patient_files.append(os.path.join(root, file))
-    
-    if not patient_files:
+    # Stream text files from all subdirectories, keeping one uniformly random pick
+    # (reservoir sampling with k=1) instead of collecting every path
+    selected_file = None
+    file_count = 0
+    pending_dirs = [data_dir] if data_dir.is_dir() else []
+    while pending_dirs:
+        with os.scandir(pending_dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
+                elif entry.name.endswith('.txt'):
+                    file_count += 1
+                    if random.randrange(file_count) == 0:
+                        selected_file = entry.path
+    
+    if selected_file is None:
         raise FileNotFoundError("No patient files found in the data directory")
     
-    # Randomly select a file
-    selected_file = random.choice(patient_files)
     print(f"📁 Selected patient file: {os.path.relpath(selected_file, project_root)}")
     
     return selected_file
@@ -78,7 +86,7 @@ def load_patient_data(file_path: str) -> str:
         raise
 
 
-def initialize_deidentifier() -> HIPAADeidentifierModular:
+def initialize_deidentifier() -> "HIPAADeidentifierModular":
     """
     Initialize the HIPAA de-identifier with proper configuration.
     
@@ -88,6 +96,9 @@ def initialize_deidentifier() -> HIPAADeidentifierModular:
     print("🔧 Initializing HIPAA de-identifier...")
     
     try:
+        # Deferred: pulls in spaCy, Presidio, torch and transformers
+        from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
+        
         # Initialize with default configuration
         deidentifier = HIPAADeidentifierModular(
             config_path="config/main.yaml",
@@ -104,7 +115,7 @@ def initialize_deidentifier() -> HIPAADeidentifierModular:
         raise
 
 
-def process_patient_data(deidentifier: HIPAADeidentifierModular, text: str) -> Dict[str, Any]:
+def process_patient_data(deidentifier: "HIPAADeidentifierModular", text: str) -> Dict[str, Any]:
     """
     Process patient data through the de-identification pipeline.
     
@@ -150,20 +161,19 @@ def display_results(result: Dict[str, Any], original_text: str) -> None:
     # Show detected entities
     if result['entities']:
         print(f"\n🔍 Detected PHI Entities:")
-        entity_counts = {}
-        for entity in result['entities']:
-            category = entity['category']
-            entity_counts[category] = entity_counts.get(category, 0) + 1
+        entity_counts = Counter(entity['category'] for entity in result['entities'])
         
         for category, count in sorted(entity_counts.items()):
             print(f"   {category}: {count} entities")
         
         print(f"\n📋 Detailed Entity List:")
-        for i, entity in enumerate(result['entities'], 1):
-            confidence = entity.get('confidence', 0)
-            print(f"   {i:2d}. {entity['category']:<15} "
-                  f"pos {entity['start']:4d}-{entity['end']:4d} "
-                  f"conf {confidence:.3f}")
+        # One write for the whole list; it grows with the number of entities
+        print("\n".join(
+            f"   {i:2d}. {entity['category']:<15} "
+            f"pos {entity['start']:4d}-{entity['end']:4d} "
+            f"conf {entity.get('confidence', 0):.3f}"
+            for i, entity in enumerate(result['entities'], 1)
+        ))
     
     # Show text preview
     print(f"\n📝 De-identified Text Preview (first 500 characters):")
@@ -184,8 +194,7 @@ def save_results(result: Dict[str, Any], output_file: str) -> None:
         output_file: Path to save the results
     """
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(output_file, result)
         
         print(f"💾 Results saved to: {output_file}")
         
@@ -6,17 +6,57 @@ This script tests all the new clinical enhancements on real-world clinical note
 from notes_examples.py to verify robust functionality. Shows detailed results for each note.
 """
 
-import json
 import os
+import re
 import sys
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tabulate import tabulate
-from hipaa_deidentifier.deidentifier import HIPAADeidentifier
 from notes_examples import ALL_NOTES
+from hipaa_deidentifier.utils.json_output import write_json
 
+# Patterns used to locate transformed values in the de-identified text
+NAME_TOKEN_RE = re.compile(r"PATIENT_[a-f0-9_]+")
+SHIFTED_DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{2}-\d{2}")
+MRN_TOKEN_RE = re.compile(r"MRN_[a-f0-9_-]+")
 
-def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
-    """Test a single clinical note and return detailed results."""
+# Patterns used by analyze_enhancements; each list is counted pattern by pattern,
+# since a fused alternation would not count text matched by two patterns twice
+INITIAL_PATTERNS = [
+    re.compile(r"\b[A-Z]\.[A-Z]\.?\b"),  # J.S., J. S.
+    re.compile(r"\(aka\s+"),  # (aka
+    re.compile(r"\(A\.N\.\)"),  # (A.N.)
+    re.compile(r"\(R\.J\."),  # (R.J.
+]
+RELATIVE_PATTERNS = [
+    re.compile(r"\b(husband|wife|son|daughter|father|mother|spouse|grandson|granddaughter)\s+[A-Z]", re.IGNORECASE),
+    re.compile(r"Next of kin:", re.IGNORECASE),
+    re.compile(r"Emergency Contact:", re.IGNORECASE),
+    re.compile(r"Primary Contact:", re.IGNORECASE)
+]
+AGE_PATTERNS = [
+    re.compile(r"\b\d{2,3}-year-old\b"),
+    re.compile(r"Age:\s*\d{2,3}"),
+    re.compile(r"\b\d{2,3}\s*yrs?\b")
+]
+AGE_NUMBER_RE = re.compile(r"\d{2,3}")
+CLINICAL_PATTERNS = [
+    re.compile(r"BP\s+\d{2,3}/\d{2,3}"),
+    re.compile(r"HR\s+\d{2,3}"),
+    re.compile(r"Temp\s+\d{2}\.\d"),
+    re.compile(r"A1c\s+\d{1,2}\.\d%"),
+    re.compile(r"LDL\s+\d{1,3}"),
+    re.compile(r"WBC\s+\d{1,2}\.\d")
+]
+DATE_PATTERNS = [
+    re.compile(r"\d{1,2}/\d{1,2}/\d{4}"),
+    re.compile(r"\d{4}-\d{2}-\d{2}"),
+    re.compile(r"\d{1,2}-\d{1,2}-\d{4}")
+]
+LONG_NUMBER_RE = re.compile(r"\b\d{7,}\b")
+
+def test_single_clinical_note(note_name, note_text, result, patient_id):
+    """Display detailed results for a single, already de-identified clinical note."""
     print("=" * 100)
     print(f"CLINICAL NOTE: {note_name.upper().replace('_', ' ')}")
     print("=" * 100)
@@ -26,9 +66,6 @@ def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
     print(note_text)
     print("-" * 80)
     
-    # De-identify the note
-    result = deidentifier.deidentify(note_text, patient_id)
-    
     # Display de-identified text
     print(f"\nDE-IDENTIFIED CLINICAL NOTE:")
     print("-" * 80)
@@ -36,17 +73,14 @@ def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
     print("-" * 80)
     
     # Count identifiers by category
-    categories = {}
-    for entity in result["entities"]:
-        cat = entity["category"]
-        categories[cat] = categories.get(cat, 0) + 1
+    categories = Counter(entity["category"] for entity in result["entities"])
+    # Sorted once; the examples table below covers the same categories
+    sorted_categories = sorted(categories)
     
     # Display category counts
     print(f"\nDETECTED PHI CATEGORIES:")
     print("-" * 40)
-    category_table = []
-    for cat, count in sorted(categories.items()):
-        category_table.append([cat, count])
+    category_table = [[cat, categories[cat]] for cat in sorted_categories]
     
     print(tabulate(
         category_table,
@@ -62,22 +96,15 @@ def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
     original_lines = note_text.strip().split('\n')
     deidentified_lines = result["text"].strip().split('\n')
     
-    # Create a table with before/after comparisons
+    # Create a table with before/after comparisons; zip stops at the shorter text
     comparison_table = []
-    
-    # Make sure we have the same number of lines to compare
-    min_lines = min(len(original_lines), len(deidentified_lines))
-    
-    for i in range(min_lines):
+    for line_number, (original_line, deidentified_line) in enumerate(zip(original_lines, deidentified_lines), 1):
+        original_line = original_line.strip()
         # Skip empty lines
-        if not original_lines[i].strip():
+        if not original_line:
             continue
-            
-        comparison_table.append([
-            i+1,  # Line number
-            original_lines[i].strip(),
-            deidentified_lines[i].strip()
-        ])
+        
+        comparison_table.append([line_number, original_line, deidentified_line.strip()])
     
     print(tabulate(
         comparison_table,
@@ -90,19 +117,24 @@ def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
     print(f"\nTRANSFORMATION EXAMPLES (ONE PER CATEGORY):")
     print("-" * 80)
     
-    # Group entities by category
-    from collections import defaultdict
-    entities_by_category = defaultdict(list)
-    
+    # Pick the best example per category in one pass: the longest of its first
+    # three entities (prefer longer text for clarity), earliest on ties
+    best_by_category = {}  # category -> [entities considered, best length, best entity]
     for entity in result["entities"]:
-        entities_by_category[entity["category"]].append(entity)
+        length = entity["end"] - entity["start"]
+        best = best_by_category.get(entity["category"])
+        if best is None:
+            best_by_category[entity["category"]] = [1, length, entity]
+        elif best[0] < 3:
+            best[0] += 1
+            if length > best[1]:
+                best[1], best[2] = length, entity
         
     # Show one clear example per category
     examples_table = []
     
-    for category, entities in sorted(entities_by_category.items()):
-        # Find the best example (prefer longer text for clarity)
-        best_entity = max(entities[:3], key=lambda e: len(note_text[e["start"]:e["end"]]))
+    for category in sorted_categories:
+        best_entity = best_by_category[category][2]
         
         # Get the original text
         original = note_text[best_entity["start"]:best_entity["end"]]
@@ -110,39 +142,30 @@ def test_single_clinical_note(note_name, note_text, deidentifier, patient_id):
         # Determine the transformation pattern
         if category == "NAME":
             # Look for actual transformation in result text
-            name_pattern = r"PATIENT_[a-f0-9_]+"
-            import re
-            
             # Search around the entity position
             start_search = max(0, best_entity["start"] - 50)
             end_search = min(len(result["text"]), best_entity["end"] + 50)
             search_area = result["text"][start_search:end_search]
             
-            matches = re.findall(name_pattern, search_area)
+            matches = NAME_TOKEN_RE.findall(search_area)
             transformed = matches[0] if matches else "[REDACTED:NAME]"
         elif category == "DATE":
             # Check if it was date-shifted or redacted
-            date_pattern = r"\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{2}-\d{2}"
-            import re
-            
             start_search = max(0, best_entity["start"] - 50)
             end_search = min(len(result["text"]), best_entity["end"] + 50)
             search_area = result["text"][start_search:end_search]
             
-            matches = re.findall(date_pattern, search_area)
+            matches = SHIFTED_DATE_RE.findall(search_area)
             transformed = matches[0] if matches else "[REDACTED-DATE]"
         elif category == "GEOGRAPHIC_SUBDIVISION":
             transformed = "[REDACTED:GEOGRAPHIC_SUBDIVISION]"
         elif category == "MRN":
             # Look for actual transformation in result text
-            mrn_pattern = r"MRN_[a-f0-9_-]+"
-            import re
-            
             start_search = max(0, best_entity["start"] - 50)
             end_search = min(len(result["text"]), best_entity["end"] + 50)
             search_area = result["text"][start_search:end_search]
             
-            matches = re.findall(mrn_pattern, search_area)
+            matches = MRN_TOKEN_RE.findall(search_area)
             transformed = matches[0] if matches else "[REDACTED:MRN]"
         elif category == "AGE_OVER_89":
             transformed = "AGE_OVER_89"
@@ -252,16 +275,8 @@ def analyze_enhancements(original_text, deidentified_text, entities):
             analysis["section_headers"] += 1
     
     # Check for initials and nicknames
-    initial_patterns = [
-        r"\b[A-Z]\.[A-Z]\.?\b",  # J.S., J. S.
-        r"\(aka\s+",  # (aka
-        r"\(A\.N\.\)",  # (A.N.)
-        r"\(R\.J\.",  # (R.J.
-    ]
-    
-    for pattern in initial_patterns:
-        import re
-        matches = re.findall(pattern, original_text)
+    for pattern in INITIAL_PATTERNS:
+        matches = pattern.findall(original_text)
         analysis["initials_nicknames"] += len(matches)
     
     # Check for facility names
@@ -275,74 +290,45 @@ def analyze_enhancements(original_text, deidentified_text, entities):
             analysis["facility_names"] += 1
     
     # Check for relatives and contacts
-    relative_patterns = [
-        r"\b(husband|wife|son|daughter|father|mother|spouse|grandson|granddaughter)\s+[A-Z]",
-        r"Next of kin:",
-        r"Emergency Contact:",
-        r"Primary Contact:"
-    ]
-    
-    for pattern in relative_patterns:
-        import re
-        matches = re.findall(pattern, original_text, re.IGNORECASE)
+    for pattern in RELATIVE_PATTERNS:
+        matches = pattern.findall(original_text)
         analysis["relatives_contacts"] += len(matches)
     
     # Check for ages over 89
-    age_patterns = [
-        r"\b\d{2,3}-year-old\b",
-        r"Age:\s*\d{2,3}",
-        r"\b\d{2,3}\s*yrs?\b"
-    ]
-    
-    for pattern in age_patterns:
-        import re
-        matches = re.findall(pattern, original_text)
+    for pattern in AGE_PATTERNS:
+        matches = pattern.findall(original_text)
         for match in matches:
             # Extract age number
-            age_num = re.search(r'\d{2,3}', match)
+            age_num = AGE_NUMBER_RE.search(match)
             if age_num and int(age_num.group()) >= 90:
                 analysis["ages_over_89"] += 1
     
     # Check for preserved clinical measurements
-    clinical_patterns = [
-        r"BP\s+\d{2,3}/\d{2,3}",
-        r"HR\s+\d{2,3}",
-        r"Temp\s+\d{2}\.\d",
-        r"A1c\s+\d{1,2}\.\d%",
-        r"LDL\s+\d{1,3}",
-        r"WBC\s+\d{1,2}\.\d"
-    ]
-    
-    for pattern in clinical_patterns:
-        import re
-        matches = re.findall(pattern, original_text)
+    for pattern in CLINICAL_PATTERNS:
+        matches = pattern.findall(original_text)
         analysis["clinical_measurements_preserved"] += len(matches)
     
     # Check for date shifting (dates that were transformed, not redacted)
-    date_patterns = [
-        r"\d{1,2}/\d{1,2}/\d{4}",
-        r"\d{4}-\d{2}-\d{2}",
-        r"\d{1,2}-\d{1,2}-\d{4}"
-    ]
-    
-    for pattern in date_patterns:
-        import re
-        original_dates = re.findall(pattern, original_text)
-        deid_dates = re.findall(pattern, deidentified_text)
+    for pattern in DATE_PATTERNS:
+        original_dates = pattern.findall(original_text)
+        deid_dates = pattern.findall(deidentified_text)
         if len(original_dates) > 0 and len(deid_dates) > 0:
             analysis["date_shifting"] += len(deid_dates)
     
     # Check for long numeric IDs
-    long_number_pattern = r"\b\d{7,}\b"
-    import re
-    long_numbers = re.findall(long_number_pattern, original_text)
+    long_numbers = LONG_NUMBER_RE.findall(original_text)
     analysis["long_numeric_ids"] = len(long_numbers)
     
     return analysis
 
 
-def test_clinical_enhancements():
-    """Test all clinical enhancements on various clinical note types."""
+def test_clinical_enhancements(interactive=True):
+    """
+    Test all clinical enhancements on various clinical note types.
+    
+    Args:
+        interactive: Pause for Enter between notes (disabled by --no-interactive)
+    """
     print("=" * 100)
     print("CLINICAL ENHANCEMENT TEST SUITE")
     print("=" * 100)
@@ -351,15 +337,23 @@ def test_clinical_enhancements():
     print()
     
     try:
-        # Initialize the de-identifier
         print("Initializing HIPAA de-identifier with clinical enhancements...")
-        deidentifier = HIPAADeidentifier(
+        # Deferred: pulls in spaCy, Presidio, torch and transformers
+        from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
+        
+        deidentifier = HIPAADeidentifierModular(
             config_path="config/main.yaml",
             spacy_model="en_core_web_lg",
             hf_model="obi/deid_bert_i2b2",
             device=-1
         )
-        print("✅ De-identifier initialized successfully")
+        
+        # De-identify all notes up front in one batch (spaCy and HF each see every note at once)
+        print(f"De-identifying {len(ALL_NOTES)} notes in one batch...")
+        batch_results = deidentifier.deidentify_batch(
+            list(ALL_NOTES.values()),
+            [f"patient_{note_name}" for note_name in ALL_NOTES]
+        )
         print()
         
         # Test results storage
@@ -376,15 +370,15 @@ def test_clinical_enhancements():
             "long_numeric_ids": 0
         }
         
-        # Test each clinical note individually
-        for i, (note_name, note_text) in enumerate(ALL_NOTES.items(), 1):
+        # Display each clinical note individually, in order
+        for i, ((note_name, note_text), note_result) in enumerate(zip(ALL_NOTES.items(), batch_results), 1):
             print(f"\n{'='*20} NOTE {i}/{len(ALL_NOTES)} {'='*20}")
             
             # Generate patient ID from note content for consistency
             patient_id = f"patient_{note_name}"
             
             # Test this specific note
-            result = test_single_clinical_note(note_name, note_text, deidentifier, patient_id)
+            result = test_single_clinical_note(note_name, note_text, note_result, patient_id)
             
             # Store results
             all_results[note_name] = result
@@ -395,7 +389,7 @@ def test_clinical_enhancements():
                     enhancement_stats[enhancement] += count
             
             # Ask user if they want to continue to next note
-            if i < len(ALL_NOTES):
+            if interactive and i < len(ALL_NOTES):
                 print(f"\n{'='*60}")
                 print(f"Press Enter to continue to next note, or 'q' to quit...")
                 user_input = input().strip().lower()
@@ -446,8 +440,7 @@ def test_clinical_enhancements():
         
         # Save detailed results
         output_file = "examples/clinical_enhancement_test_results.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        write_json(output_file, all_results)
         print(f"\n✅ Detailed results saved to: {output_file}")
         
         # Final summary
@@ -469,5 +462,5 @@ def test_clinical_enhancements():
 
 
 if __name__ == "__main__":
-    success = test_clinical_enhancements()
+    success = test_clinical_enhancements(interactive="--no-interactive" not in sys.argv[1:])
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -22,7 +22,10 @@ Ye approach har identifier ko uske best-suited detector se process karta hai,
 jisse accuracy improve hoti hai aur over/under-redaction kam hota hai.
 """
 
+import hashlib
 import re
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Dict, List, Optional
 
 from config.config import config as global_config
@@ -34,6 +37,47 @@ from hipaa_deidentifier.phi_detection.identifier.huggingface_model_identifier im
 from .phi_redaction.phi_redactor import PHIRedactor
 from .utils.color_output import colorize_deidentified_text
 
+# Detector weights for overlap voting
+DETECTOR_WEIGHTS = {
+    # Presidio is best for structured data
+    "presidio": {
+        "PHONE_NUMBER": 1.2, "FAX_NUMBER": 1.2, "EMAIL_ADDRESS": 1.2,
+        "US_SSN": 1.2, "URL": 1.2, "IP_ADDRESS": 1.2,
+        "LICENSE_NUMBER": 1.2, "VEHICLE_ID": 1.2, "MEDICAL_DEVICE_ID": 1.2,
+        "DEFAULT": 0.8  # Lower weight for other categories
+    },
+    # spaCy is best for general entities
+    "spacy": {
+        "NAME": 1.2, "LOCATION": 1.2, "ORGANIZATION": 1.2, "DATE": 1.2,
+        "DEFAULT": 0.8  # Lower weight for other categories
+    },
+    # HF is best for medical-specific entities
+    "hf": {
+        "MRN": 1.2, "HEALTH_PLAN_ID": 1.2, "ACCOUNT_NUMBER": 1.2,
+        "BIOMETRIC_ID": 1.2, "PHOTO_ID": 1.2, 
+        # OTHER_ID removed as per user request
+        "AGE_OVER_89": 1.2,
+        "DEFAULT": 0.8  # Lower weight for other categories
+    },
+    # Default for unknown sources
+    "unknown": {
+        "DEFAULT": 1.0
+    }
+}
+
+# Flattened views of DETECTOR_WEIGHTS: one lookup per entity instead of two
+DETECTOR_WEIGHT_TABLE = {
+    (source, category): weight
+    for source, weights in DETECTOR_WEIGHTS.items()
+    for category, weight in weights.items()
+    if category != "DEFAULT"
+}
+DETECTOR_DEFAULT_WEIGHTS = {source: weights["DEFAULT"] for source, weights in DETECTOR_WEIGHTS.items()}
+
+# Gaps allowed between entity fragments that get merged (Stage 3)
+DATE_PART_SEPARATORS = frozenset(["", "/", "-", "."])
+NAME_PART_GAP_PATTERN = re.compile(r'[\s\.]*')  # Whitespace and periods only
+
 
 class HIPAADeidentifierModular:
     """
@@ -44,7 +88,10 @@ class HIPAADeidentifierModular:
     detectors for different types of identifiers.
     """
     
-    def __init__(self, config_path: Optional[str] = None, spacy_model: Optional[str] = None, hf_model: Optional[str] = None, device: int = -1):
+    # Number of recently de-identified texts whose detected entities are kept for reuse
+    DETECTION_CACHE_SIZE = 256
+    
+    def __init__(self, config_path: Optional[str] = None, spacy_model: Optional[str] = None, hf_model: Optional[str] = None, device: int = -1, use_fp16: Optional[bool] = None, quantize_int8: Optional[bool] = None):
         """
         Initializes the de-identifier with the specified configuration.
         
@@ -53,6 +100,8 @@ class HIPAADeidentifierModular:
             spacy_model: Name of the spaCy model to use for entity detection
             hf_model: Name of the Hugging Face model to use for entity detection
             device: Device to run ML inference on (-1 for CPU, 0+ for specific GPU)
+            use_fp16: Run the HF model in half precision on GPU (None uses models.use_fp16 from config)
+            quantize_int8: Run the HF model with int8 dynamic quantization on CPU (None uses models.quantize_int8 from config)
         """
         # Get configuration from global config
         self.config = global_config.get_settings()
@@ -81,13 +130,18 @@ class HIPAADeidentifierModular:
             self.hf_detector = HFDeidentifier(
                 hf_model=hf_model,
                 device=device,
-                config=self.config
+                config=self.config,
+                use_fp16=use_fp16,
+                quantize_int8=quantize_int8
             )
         else:
             self.hf_detector = None
             
         # Initialize the redactor
         self.redactor = PHIRedactor(self.config)
+        
+        # LRU of detected entities keyed by a digest of the text (redaction depends on patient_id, so it is not cached)
+        self._detection_cache = OrderedDict()
     
     def deidentify(self, text: str, patient_id: Optional[str] = None) -> Dict:
         """
@@ -101,8 +155,41 @@ class HIPAADeidentifierModular:
             A dictionary containing the de-identified text and detected entities
         """
         # Detect PHI entities
-        entities = self._detect_phi(text)
+        entities = self._detect_phi_cached(text)
+        
+        return self._build_result(text, entities, patient_id)
+    
+    def deidentify_batch(self, texts: List[str], patient_ids: Optional[List[Optional[str]]] = None) -> List[Dict]:
+        """
+        De-identifies PHI in several texts, batching the HF model across all of them.
+        
+        Args:
+            texts: The texts to de-identify
+            patient_ids: Optional patient identifiers, one per text
+            
+        Returns:
+            One result dictionary per text, in input order (same shape as deidentify)
+        """
+        if patient_ids is None:
+            patient_ids = [None] * len(texts)
         
+        return [
+            self._build_result(text, entities, patient_id)
+            for text, entities, patient_id in zip(texts, self._detect_phi_batch_cached(texts), patient_ids)
+        ]
+    
+    def _build_result(self, text: str, entities: List[PHIEntity], patient_id: Optional[str]) -> Dict:
+        """
+        Redacts the detected entities and builds the serializable result.
+        
+        Args:
+            text: The original text
+            entities: Detected PHI entities with positions in the original text
+            patient_id: Optional patient identifier for consistent pseudonyms and date shifting
+            
+        Returns:
+            A dictionary containing the de-identified text and detected entities
+        """
         # Redact the detected PHI
         deidentified_text = self.redactor.redact_text(text, entities, patient_id)
         
@@ -113,7 +200,7 @@ class HIPAADeidentifierModular:
                 "end": entity.end,
                 "category": entity.category,
                 "confidence": round(entity.confidence, 3),
-                "source": getattr(entity, "source", "unknown")  # Include source if available
+                "source": entity.source
             }
             for entity in entities
         ]
@@ -142,6 +229,80 @@ class HIPAADeidentifierModular:
         
         return result
     
+    @staticmethod
+    def _detection_key(text: str) -> bytes:
+        """
+        Returns the detection cache key for a text (a digest, so raw notes are not kept as keys).
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            The SHA-256 digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).digest()
+    
+    @staticmethod
+    def _copy_entities(entities) -> List[PHIEntity]:
+        """
+        Returns fresh copies of cached entities, so callers cannot mutate the cached ones.
+        
+        Args:
+            entities: Cached PHI entities
+            
+        Returns:
+            A new list of copied PHI entities
+        """
+        return [replace(entity) for entity in entities]
+    
+    def _detect_phi_cached(self, text: str) -> List[PHIEntity]:
+        """
+        Detects PHI entities, reusing the result for recently seen texts.
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            A list of detected PHI entities with positions in original text
+        """
+        key = self._detection_key(text)
+        entities = self._detection_cache.get(key)
+        if entities is not None:
+            self._detection_cache.move_to_end(key)
+            return self._copy_entities(entities)
+        
+        entities = tuple(self._detect_phi(text))
+        self._detection_cache[key] = entities
+        if len(self._detection_cache) > self.DETECTION_CACHE_SIZE:
+            self._detection_cache.popitem(last=False)
+        return self._copy_entities(entities)
+    
+    def _detect_phi_batch_cached(self, texts: List[str]) -> List[List[PHIEntity]]:
+        """
+        Detects PHI entities in several texts, running the pipeline only over distinct uncached ones.
+        
+        Args:
+            texts: The texts to analyze
+            
+        Returns:
+            One list of detected PHI entities per text, in input order
+        """
+        keys = [self._detection_key(text) for text in texts]
+        entities_by_key = {}
+        for key in keys:
+            cached = self._detection_cache.get(key)
+            if cached is not None:
+                entities_by_key[key] = cached
+        
+        missing = {key: text for key, text in zip(keys, texts) if key not in entities_by_key}
+        if missing:
+            for key, entities in zip(missing, self._detect_phi_batch(list(missing.values()))):
+                entities_by_key[key] = self._detection_cache[key] = tuple(entities)
+            while len(self._detection_cache) > self.DETECTION_CACHE_SIZE:
+                self._detection_cache.popitem(last=False)
+        
+        return [self._copy_entities(entities_by_key[key]) for key in keys]
+    
     def _detect_phi(self, text: str) -> List[PHIEntity]:
         """
         Detects PHI entities using a modular pipeline with specialized detectors.
@@ -157,8 +318,96 @@ class HIPAADeidentifierModular:
         Returns:
             A list of detected PHI entities with positions in original text
         """
+        # Stage 0 and 1.1: normalize and run the rule-based detectors
+        normalized_text, project_fn, presidio_entities, masked_text_for_hf = self._detect_rules(text)
+        
+        # 1.3: HF/BERT runs on the masked text to find contextual entities
+        hf_entities = []
+        if self.hf_detector:
+            hf_entities = self.hf_detector.detect(masked_text_for_hf)
+        
+        # Stages 2-4: project, merge and resolve
+        return self._finalize_entities(text, project_fn, presidio_entities + hf_entities)
+    
+    def _detect_phi_batch(self, texts: List[str]) -> List[List[PHIEntity]]:
+        """
+        Detects PHI entities in several texts, running the HF model once over all of them.
+        
+        Args:
+            texts: The texts to analyze
+            
+        Returns:
+            One list of detected PHI entities per text, with positions in that text
+        """
+        # Stage 0 and 1.1; Presidio's spaCy pass runs over all texts with nlp.pipe
+        rule_results = self._detect_rules_batch(texts)
+        
+        # 1.3: HF/BERT over all masked texts in shared batches
+        if self.hf_detector:
+            hf_results = self.hf_detector.detect_batch([masked for _, _, _, masked in rule_results])
+        else:
+            hf_results = [[] for _ in texts]
+        
+        return [
+            self._finalize_entities(text, project_fn, presidio_entities + hf_entities)
+            for text, (_, project_fn, presidio_entities, _), hf_entities in zip(texts, rule_results, hf_results)
+        ]
+    
+    def _detect_rules(self, text: str) -> tuple:
+        """
+        Normalizes the text and runs the rule-based (Presidio) detectors on it.
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            Tuple of (normalized text, projection function, Presidio entities,
+            normalized text with Presidio spans masked for the HF model)
+        """
         # Stage 0: Normalize text while maintaining character mapping
         stage0_result = self.text_normalizer.stage0_normalize_and_candidates(text)
+        
+        presidio_entities = None
+        if self.config["detect"]["enable_rules"]:
+            presidio_entities = self.presidio_detector.detect(stage0_result["normalized_text"])
+        
+        return self._apply_rules(stage0_result, presidio_entities)
+    
+    def _detect_rules_batch(self, texts: List[str]) -> List[tuple]:
+        """
+        Batched _detect_rules: Presidio analyzes all normalized texts with one spaCy pipe.
+        
+        Args:
+            texts: The texts to analyze
+            
+        Returns:
+            One _detect_rules tuple per text, in input order
+        """
+        # Stage 0: Normalize text while maintaining character mapping
+        stage0_results = [self.text_normalizer.stage0_normalize_and_candidates(text) for text in texts]
+        
+        if self.config["detect"]["enable_rules"]:
+            presidio_results = self.presidio_detector.detect_batch([result["normalized_text"] for result in stage0_results])
+        else:
+            presidio_results = [None] * len(texts)
+        
+        return [
+            self._apply_rules(stage0_result, presidio_entities)
+            for stage0_result, presidio_entities in zip(stage0_results, presidio_results)
+        ]
+    
+    def _apply_rules(self, stage0_result: Dict, detected_entities: Optional[List[PHIEntity]]) -> tuple:
+        """
+        Completes the rule stage for one normalized text and masks its hits for the HF model.
+        
+        Args:
+            stage0_result: Stage 0 normalization result for the text
+            detected_entities: Presidio.detect entities for the normalized text, or None when rules are disabled
+            
+        Returns:
+            Tuple of (normalized text, projection function, Presidio entities,
+            normalized text with Presidio spans masked for the HF model)
+        """
         normalized_text = stage0_result["normalized_text"]
         project_fn = stage0_result["project_fn"]
         
@@ -166,8 +415,8 @@ class HIPAADeidentifierModular:
         presidio_entities = []
         
         # 1.1: Presidio for structured data (if enabled)
-        if self.config["detect"]["enable_rules"]:
-            presidio_entities.extend(self.presidio_detector.detect(normalized_text))
+        if detected_entities is not None:
+            presidio_entities.extend(detected_entities)
             
             # Also detect header patterns
             presidio_entities.extend(self.presidio_detector.detect_with_header_patterns(normalized_text))
@@ -175,25 +424,38 @@ class HIPAADeidentifierModular:
             # Create a masked version of the text for the next stage
             # This prevents the HF model from re-detecting what Presidio already found.
             # We replace with '#' to preserve character indices and sentence structure.
-            masked_text_for_hf = list(normalized_text)
-            for entity in presidio_entities:
-                for i in range(entity.start, entity.end):
-                    if i < len(masked_text_for_hf):
-                        masked_text_for_hf[i] = '#'
-            masked_text_for_hf = "".join(masked_text_for_hf)
+            # Spans are spliced in one left-to-right pass over the merged intervals.
+            parts = []
+            cursor = 0
+            for start, end in sorted((entity.start, entity.end) for entity in presidio_entities):
+                start = max(start, cursor)
+                end = min(end, len(normalized_text))
+                if end > start:
+                    parts.append(normalized_text[cursor:start])
+                    parts.append('#' * (end - start))
+                    cursor = end
+            parts.append(normalized_text[cursor:])
+            masked_text_for_hf = "".join(parts)
         else:
             masked_text_for_hf = normalized_text
         
         # 1.2: spaCy functionality is now integrated into Presidio
         
-        # 1.3: HF/BERT runs on the masked text to find contextual entities
-        hf_entities = []
-        if self.hf_detector:
-            hf_entities = self.hf_detector.detect(masked_text_for_hf)
-
-        # Combine all entities from all stages
-        entities = presidio_entities + hf_entities
+        return normalized_text, project_fn, presidio_entities, masked_text_for_hf
+    
+    def _finalize_entities(self, text: str, project_fn, entities: List[PHIEntity]) -> List[PHIEntity]:
+        """
+        Projects detected spans back to the original text, merges related entities
+        and resolves overlaps.
         
+        Args:
+            text: The original text
+            project_fn: Maps (start, end) in the normalized text to the original text
+            entities: Entities detected on the normalized text
+            
+        Returns:
+            The final list of PHI entities with positions in the original text
+        """
         # Stage 2: Project all detected spans back to original text
         original_entities = []
         for entity in entities:
@@ -206,9 +468,9 @@ class HIPAADeidentifierModular:
                 end=original_span[1],
                 category=entity.category,
                 confidence=entity.confidence,
-                text=text[original_span[0]:original_span[1]]  # Extract text from original
+                text=text[original_span[0]:original_span[1]],  # Extract text from original
+                source=entity.source  # Preserve the source
             )
-            original_entity.source = getattr(entity, "source", "unknown")  # Preserve the source
             original_entities.append(original_entity)
         
         # Stage 3: Merge related entities (like date components and MRN parts)
@@ -236,61 +498,46 @@ class HIPAADeidentifierModular:
         # Sort entities by start position, then by end position (longer spans first)
         sorted_entities = sorted(entities, key=lambda e: (e.start, -e.end))
         
-        # Detector weights for voting
-        detector_weights = {
-            # Presidio is best for structured data
-            "presidio": {
-                "PHONE_NUMBER": 1.2, "FAX_NUMBER": 1.2, "EMAIL_ADDRESS": 1.2,
-                "US_SSN": 1.2, "URL": 1.2, "IP_ADDRESS": 1.2,
-                "LICENSE_NUMBER": 1.2, "VEHICLE_ID": 1.2, "MEDICAL_DEVICE_ID": 1.2,
-                "DEFAULT": 0.8  # Lower weight for other categories
-            },
-            # spaCy is best for general entities
-            "spacy": {
-                "NAME": 1.2, "LOCATION": 1.2, "ORGANIZATION": 1.2, "DATE": 1.2,
-                "DEFAULT": 0.8  # Lower weight for other categories
-            },
-            # HF is best for medical-specific entities
-            "hf": {
-                "MRN": 1.2, "HEALTH_PLAN_ID": 1.2, "ACCOUNT_NUMBER": 1.2,
-                "BIOMETRIC_ID": 1.2, "PHOTO_ID": 1.2, 
-                # OTHER_ID removed as per user request
-                "AGE_OVER_89": 1.2,
-                "DEFAULT": 0.8  # Lower weight for other categories
-            },
-            # Default for unknown sources
-            "unknown": {
-                "DEFAULT": 1.0
-            }
-        }
+        # Fast path: if no entity starts before its predecessor ends, nothing overlaps
+        # and every entity would be kept as is
+        if all(current.start >= previous.end for previous, current in zip(sorted_entities, sorted_entities[1:])):
+            return sorted_entities
         
         # Function to calculate weighted confidence
         def weighted_confidence(entity: PHIEntity) -> float:
-            source = getattr(entity, "source", "unknown")
-            source_weights = detector_weights.get(source, detector_weights["unknown"])
-            weight = source_weights.get(entity.category, source_weights["DEFAULT"])
+            weight = DETECTOR_WEIGHT_TABLE.get((entity.source, entity.category))
+            if weight is None:
+                weight = DETECTOR_DEFAULT_WEIGHTS.get(entity.source, DETECTOR_DEFAULT_WEIGHTS["unknown"])
             return entity.confidence * weight
         
-        # Resolve overlaps
+        # Resolve overlaps in one sweep. Kept entities never overlap and all start at or
+        # before the current entity, so only the kept entity reaching furthest right can
+        # overlap it. Replaced entities are blanked out and the winner appended, which
+        # keeps the kept order identical to a remove + append.
         final_entities = []
+        final_weights = []
+        widest = -1  # index into final_entities of the kept entity with the largest end
         for entity in sorted_entities:
-            # Check if this entity overlaps with any in the final list
-            overlaps = False
-            for final_entity in final_entities:
-                if (entity.start < final_entity.end and entity.end > final_entity.start):
-                    overlaps = True
+            weight = weighted_confidence(entity)
+            if widest >= 0:
+                final_entity = final_entities[widest]
+                if entity.start < final_entity.end and entity.end > final_entity.start:
                     # If this entity has higher weighted confidence, replace the final entity
-                    if weighted_confidence(entity) > weighted_confidence(final_entity):
-                        final_entities.remove(final_entity)
+                    if weight > final_weights[widest]:
+                        final_entities[widest] = None
                         final_entities.append(entity)
-                    break
+                        final_weights.append(weight)
+                        widest = len(final_entities) - 1
+                    continue
             
             # If no overlap, add to final list
-            if not overlaps:
-                final_entities.append(entity)
+            final_entities.append(entity)
+            final_weights.append(weight)
+            if widest < 0 or entity.end > final_entities[widest].end:
+                widest = len(final_entities) - 1
         
         # Sort final entities by position
-        return sorted(final_entities, key=lambda e: e.start)
+        return sorted((e for e in final_entities if e is not None), key=lambda e: e.start)
         
     def _merge_related_entities(self, entities: List[PHIEntity], text: str) -> List[PHIEntity]:
         """
@@ -311,134 +558,71 @@ class HIPAADeidentifierModular:
         # Sort entities by start position
         sorted_entities = sorted(entities, key=lambda e: e.start)
         
-        # First pass: identify date components
-        date_components = []
-        for i, entity in enumerate(sorted_entities):
-            if entity.category == "DATE":
-                date_components.append(i)
-        
-        # Second pass: merge adjacent date components
-        merged_dates = []
-        i = 0
-        while i < len(date_components):
-            current_idx = date_components[i]
-            current = sorted_entities[current_idx]
+        # Single pass: each DATE/MRN/NAME component is paired with the next component
+        # of the same category (other categories may sit in between). A merged pair is
+        # consumed, so the following component starts a new pair.
+        result = sorted_entities.copy()
+        merges = []  # (index of first component, merged entity)
+        pending = {}  # category -> index of the component still waiting for a partner
+        for next_idx, next_entity in enumerate(sorted_entities):
+            category = next_entity.category
+            if category not in ("DATE", "MRN", "NAME"):
+                continue
             
-            # Look for adjacent date components
-            if i + 1 < len(date_components):
-                next_idx = date_components[i + 1]
-                next_entity = sorted_entities[next_idx]
-                
-                # Check if they are close enough (within 5 characters)
-                if next_entity.start - current.end <= 5:
-                    # Check the text between them
-                    between_text = text[current.end:next_entity.start]
-                    
-                    # If it's just a separator like "/" or "-" or whitespace
-                    if between_text.strip() in ["", "/", "-", "."]:
-                        # Create a merged entity
-                        merged_entity = PHIEntity(
-                            start=current.start,
-                            end=next_entity.end,
-                            category="DATE",
-                            confidence=max(current.confidence, next_entity.confidence),
-                            text=text[current.start:next_entity.end]
-                        )
-                        # Preserve source from the entity with higher confidence
-                        merged_entity.source = current.source if current.confidence >= next_entity.confidence else next_entity.source
-                        merged_dates.append((current_idx, next_idx, merged_entity))
-                        i += 2  # Skip both entities
-                        continue
+            current_idx = pending.pop(category, None)
+            if current_idx is None:
+                pending[category] = next_idx
+                continue
             
-            i += 1
-        
-        # Third pass: identify MRN components
-        mrn_components = []
-        for i, entity in enumerate(sorted_entities):
-            if entity.category == "MRN":
-                mrn_components.append(i)
-        
-        # Fourth pass: merge adjacent MRN components
-        merged_mrns = []
-        i = 0
-        while i < len(mrn_components):
-            current_idx = mrn_components[i]
             current = sorted_entities[current_idx]
+            if not self._can_merge_components(current, next_entity, text):
+                pending[category] = next_idx
+                continue
             
-            # Look for adjacent MRN components
-            if i + 1 < len(mrn_components):
-                next_idx = mrn_components[i + 1]
-                next_entity = sorted_entities[next_idx]
-                
-                # Check if they are close enough (within 5 characters)
-                if next_entity.start - current.end <= 5:
-                    # Create a merged entity
-                    merged_entity = PHIEntity(
-                        start=current.start,
-                        end=next_entity.end,
-                        category="MRN",
-                        confidence=max(current.confidence, next_entity.confidence),
-                        text=text[current.start:next_entity.end]
-                    )
-                    # Preserve source from the entity with higher confidence
-                    merged_entity.source = current.source if current.confidence >= next_entity.confidence else next_entity.source
-                    merged_mrns.append((current_idx, next_idx, merged_entity))
-                    i += 2  # Skip both entities
-                    continue
-            
-            i += 1
-            
-        # Fifth pass: identify and merge adjacent NAME components
-        name_components = []
-        for i, entity in enumerate(sorted_entities):
-            if entity.category == "NAME":
-                name_components.append(i)
-
-        merged_names = []
-        i = 0
-        while i < len(name_components):
-            current_idx = name_components[i]
-            current = sorted_entities[current_idx]
+            # Create a merged entity
+            merged_entity = PHIEntity(
+                start=current.start,
+                end=next_entity.end,
+                category=category,
+                confidence=max(current.confidence, next_entity.confidence),
+                text=text[current.start:next_entity.end],
+                # Preserve source from the entity with higher confidence
+                source=current.source if current.confidence >= next_entity.confidence else next_entity.source
+            )
+            result[current_idx] = None
+            result[next_idx] = None
+            merges.append((current_idx, merged_entity))
+        
+        # Merged entities go after the untouched ones (latest first pair first), then
+        # everything is sorted again by start position
+        result = [entity for entity in result if entity is not None]
+        result.extend(merged_entity for _, merged_entity in sorted(merges, key=lambda x: x[0], reverse=True))
+        return sorted(result, key=lambda e: e.start)
+    
+    def _can_merge_components(self, current: PHIEntity, next_entity: PHIEntity, text: str) -> bool:
+        """
+        Decide whether two components of the same category form one entity.
+        
+        Args:
+            current: Earlier component
+            next_entity: Next component of the same category
+            text: The original text
             
-            # Look for adjacent NAME components
-            if i + 1 < len(name_components):
-                next_idx = name_components[i + 1]
-                next_entity = sorted_entities[next_idx]
-                
-                # Check if they are close enough (within 3 characters of whitespace or punctuation)
-                if next_entity.start - current.end <= 3:
-                    between_text = text[current.end:next_entity.start]
-                    if re.match(r'^[\s\.]*$', between_text):  # Allow whitespace and periods
-                        # Create a merged entity
-                        merged_entity = PHIEntity(
-                            start=current.start,
-                            end=next_entity.end,
-                            category="NAME",
-                            confidence=max(current.confidence, next_entity.confidence),
-                            text=text[current.start:next_entity.end]
-                        )
-                        merged_entity.source = current.source if current.confidence >= next_entity.confidence else next_entity.source
-                        merged_names.append((current_idx, next_idx, merged_entity))
-                        i += 2  # Skip both entities
-                        continue
-            i += 1
-        
-        # Apply merges (from end to start to preserve indices)
-        result = sorted_entities.copy()
+        Returns:
+            True if the components should be merged
+        """
+        gap = next_entity.start - current.end
         
-        # Sort merges by the first index in reverse order
-        all_merges = sorted(merged_dates + merged_mrns + merged_names, key=lambda x: x[0], reverse=True)
+        if current.category == "DATE":
+            # Within 5 characters, separated only by "/", "-", "." or whitespace
+            return gap <= 5 and text[current.end:next_entity.start].strip() in DATE_PART_SEPARATORS
         
-        for first_idx, second_idx, merged_entity in all_merges:
-            # Remove the two original entities
-            result.pop(second_idx)
-            result.pop(first_idx)
-            
-            # Add the merged entity
-            result.append(merged_entity)
+        if current.category == "MRN":
+            # Within 5 characters
+            return gap <= 5
         
-        # Sort again by start position
-        return sorted(result, key=lambda e: e.start)
+        # NAME: within 3 characters of whitespace or periods
+        return gap <= 3 and NAME_PART_GAP_PATTERN.fullmatch(text[current.end:next_entity.start]) is not None
 
 
 # For backwards compatibility
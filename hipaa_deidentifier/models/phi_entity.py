@@ -6,6 +6,7 @@ Defines the data structures for representing detected PHI entities.
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple
 import re
+import sys
 
 from .phi_taxonomy import (
     normalize_category, 
@@ -15,7 +16,11 @@ from .phi_taxonomy import (
 )
 
 
-@dataclass
+# slots=True needs Python 3.10+; older interpreters get a regular dataclass
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class PHIEntity:
     """
     Represents a detected Protected Health Information (PHI) entity in text.
@@ -26,12 +31,14 @@ class PHIEntity:
         category: Category of PHI (e.g., NAME, MRN, SSN)
         confidence: Confidence score of the detection (0.0 to 1.0)
         text: The actual text content of the entity
+        source: Detector that produced the entity (e.g., presidio, hf)
     """
     start: int
     end: int
     category: str
     confidence: float
     text: str
+    source: str = "unknown"
 
     def __post_init__(self):
         """Normalize the category after initialization."""
@@ -107,8 +107,8 @@ ENTITY_PRECEDENCE = [
 # Convert precedence list to a dict for O(1) lookup
 ENTITY_PRIORITY = {label: i for i, label in enumerate(ENTITY_PRECEDENCE)}
 
-# Header/boilerplate terms to ignore - simplified to essentials
-HEADER_WHITELIST = {
+# Header/boilerplate terms to ignore - simplified to essentials (exact, case-sensitive matches)
+HEADER_WHITELIST = frozenset({
     # Document headers
     "HIPAA",
     "Safe Harbor",
@@ -199,7 +199,7 @@ HEADER_WHITELIST = {
     "clopidogrel",
     "metoprolol",
     "insulin",
-}
+})
 
 def normalize_category(category: str) -> str:
     """
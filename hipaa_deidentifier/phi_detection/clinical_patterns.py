@@ -15,6 +15,15 @@ from typing import List, Dict, Tuple, Set, Optional
 
 from ..models.phi_entity import PHIEntity
 
+# Non-empty lines of a note
+LINE_PATTERN = re.compile(r"([^\n]+)")
+
+# Section header values ("Patient Name: John Smith", "MRN: 123456789", ...)
+NAME_HEADER_PATTERN = re.compile(r"(?:patient\s+name|name|patient)\s*:\s*([^\n]+)", re.IGNORECASE)
+MRN_HEADER_PATTERN = re.compile(r"(?:mrn|medical\s+record\s+number|record\s+number)\s*:\s*([^\n]+)", re.IGNORECASE)
+DOB_HEADER_PATTERN = re.compile(r"(?:dob|date\s+of\s+birth|birth\s+date)\s*:\s*([^\n]+)", re.IGNORECASE)
+AGE_HEADER_PATTERN = re.compile(r"(?:age|patient\s+age)\s*:\s*(\d{1,3})", re.IGNORECASE)
+
 
 def detect_section_headers(text: str) -> List[PHIEntity]:
     """
@@ -31,12 +40,12 @@ def detect_section_headers(text: str) -> List[PHIEntity]:
     entities = []
     
     # Process the text line by line
-    for line_match in re.finditer(r"([^\n]+)", text):
+    for line_match in LINE_PATTERN.finditer(text):
         line = line_match.group(1)
         line_start = line_match.start()
         
         # Patient name patterns
-        name_match = re.search(r"(?:patient\s+name|name|patient)\s*:\s*([^\n]+)", line, re.IGNORECASE)
+        name_match = NAME_HEADER_PATTERN.search(line)
         if name_match:
             value = name_match.group(1).strip()
             if value and len(value) > 1:  # Avoid empty or single-character matches
@@ -51,7 +60,7 @@ def detect_section_headers(text: str) -> List[PHIEntity]:
                 ))
         
         # MRN patterns
-        mrn_match = re.search(r"(?:mrn|medical\s+record\s+number|record\s+number)\s*:\s*([^\n]+)", line, re.IGNORECASE)
+        mrn_match = MRN_HEADER_PATTERN.search(line)
         if mrn_match:
             value = mrn_match.group(1).strip()
             if value and len(value) > 1:
@@ -66,7 +75,7 @@ def detect_section_headers(text: str) -> List[PHIEntity]:
                 ))
         
         # DOB patterns
-        dob_match = re.search(r"(?:dob|date\s+of\s+birth|birth\s+date)\s*:\s*([^\n]+)", line, re.IGNORECASE)
+        dob_match = DOB_HEADER_PATTERN.search(line)
         if dob_match:
             value = dob_match.group(1).strip()
             if value and len(value) > 1:
@@ -81,7 +90,7 @@ def detect_section_headers(text: str) -> List[PHIEntity]:
                 ))
                 
         # Age patterns with special handling for ages ≥ 89
-        age_match = re.search(r"(?:age|patient\s+age)\s*:\s*(\d{1,3})", line, re.IGNORECASE)
+        age_match = AGE_HEADER_PATTERN.search(line)
         if age_match:
             age_value = age_match.group(1).strip()
             if age_value:
@@ -100,6 +109,14 @@ def detect_section_headers(text: str) -> List[PHIEntity]:
     return entities
 
 
+# Initials like "J.S." or "J. S."
+INITIALS_PATTERN = re.compile(r"\b[A-Z]\.\s*[A-Z]\.?\b")
+# Nicknames like "Johnny (nickname John)" or "Johnny (aka John)"
+NICKNAME_PATTERN = re.compile(r"\b[A-Z][a-z]+\s+\((?:nickname|aka|AKA|a\.k\.a\.|called)\s+[A-Z][a-z]+\)")
+# Parenthetical names like "John (Smith)"
+PARENTHETICAL_NAME_PATTERN = re.compile(r"\b[A-Z][a-z]+\s+\([A-Z][a-z]+\)")
+
+
 def detect_initials_and_nicknames(text: str) -> List[PHIEntity]:
     """
     Detect initials and nicknames in clinical notes.
@@ -115,8 +132,7 @@ def detect_initials_and_nicknames(text: str) -> List[PHIEntity]:
     entities = []
     
     # Detect initials like "J.S." or "J. S."
-    initial_pattern = r"\b[A-Z]\.\s*[A-Z]\.?\b"
-    for match in re.finditer(initial_pattern, text):
+    for match in INITIALS_PATTERN.finditer(text):
         entities.append(PHIEntity(
             start=match.start(),
             end=match.end(),
@@ -126,8 +142,7 @@ def detect_initials_and_nicknames(text: str) -> List[PHIEntity]:
         ))
     
     # Detect nicknames like "Johnny (nickname John)" or "Johnny (aka John)"
-    nickname_pattern = r"\b[A-Z][a-z]+\s+\((?:nickname|aka|AKA|a\.k\.a\.|called)\s+[A-Z][a-z]+\)"
-    for match in re.finditer(nickname_pattern, text):
+    for match in NICKNAME_PATTERN.finditer(text):
         entities.append(PHIEntity(
             start=match.start(),
             end=match.end(),
@@ -137,8 +152,7 @@ def detect_initials_and_nicknames(text: str) -> List[PHIEntity]:
         ))
         
     # Detect parenthetical names like "John (Smith)"
-    parenthetical_name = r"\b[A-Z][a-z]+\s+\([A-Z][a-z]+\)"
-    for match in re.finditer(parenthetical_name, text):
+    for match in PARENTHETICAL_NAME_PATTERN.finditer(text):
         entities.append(PHIEntity(
             start=match.start(),
             end=match.end(),
@@ -150,6 +164,22 @@ def detect_initials_and_nicknames(text: str) -> List[PHIEntity]:
     return entities
 
 
+# More specific facility patterns to avoid over-detection. Tried in order: the first
+# pattern that matches a line wins, so these stay separate rather than one alternation.
+FACILITY_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        # Full hospital names with specific patterns
+        r"\b[A-Z][a-z]+\s+(?:Hospital|Medical Center|Health System|Healthcare)\b",
+        r"\b[A-Z][a-z]+\s+(?:Memorial|Regional|Community)\s+(?:Hospital|Medical Center)\b",
+        r"\b[A-Z][a-z]+\s+University\s+(?:Hospital|Medical Center|Health System)\b",
+        r"\b[A-Z][a-z]+\s+(?:Center|Institute)\s+for\s+[A-Z][a-z]+\b",
+        # Clinic patterns
+        r"\b[A-Z][a-z]+\s+(?:Clinic|Medical Group|Physicians)\b",
+    ]
+]
+
+
 def detect_facility_names(text: str) -> List[PHIEntity]:
     """
     Detect hospital and clinic names in clinical notes.
@@ -162,25 +192,14 @@ def detect_facility_names(text: str) -> List[PHIEntity]:
     """
     entities = []
     
-    # More specific facility patterns to avoid over-detection
-    facility_patterns = [
-        # Full hospital names with specific patterns
-        r"\b[A-Z][a-z]+\s+(?:Hospital|Medical Center|Health System|Healthcare)\b",
-        r"\b[A-Z][a-z]+\s+(?:Memorial|Regional|Community)\s+(?:Hospital|Medical Center)\b",
-        r"\b[A-Z][a-z]+\s+University\s+(?:Hospital|Medical Center|Health System)\b",
-        r"\b[A-Z][a-z]+\s+(?:Center|Institute)\s+for\s+[A-Z][a-z]+\b",
-        # Clinic patterns
-        r"\b[A-Z][a-z]+\s+(?:Clinic|Medical Group|Physicians)\b",
-    ]
-    
     # Process the text line by line
-    for line_match in re.finditer(r"([^\n]+)", text):
+    for line_match in LINE_PATTERN.finditer(text):
         line = line_match.group(1)
         line_start = line_match.start()
         
         # Check each facility pattern
-        for pattern in facility_patterns:
-            facility_match = re.search(pattern, line, re.IGNORECASE)
+        for pattern in FACILITY_PATTERNS:
+            facility_match = pattern.search(line)
             if facility_match:
                 facility_text = facility_match.group().strip()
                 # Additional validation: make sure it's a proper facility name
@@ -199,6 +218,24 @@ def detect_facility_names(text: str) -> List[PHIEntity]:
     return entities
 
 
+# List of relationship terms
+RELATIONSHIP_TERMS = [
+    "wife", "husband", "spouse", "partner", 
+    "son", "daughter", "child", "children",
+    "mother", "father", "parent", "guardian",
+    "sister", "brother", "sibling",
+    "aunt", "uncle", "cousin",
+    "grandmother", "grandfather", "grandparent",
+    "grandson", "granddaughter", "grandchild"
+]
+
+# Relationship followed by capitalized name
+RELATIVE_NAME_PATTERN = re.compile(
+    r"\b(" + "|".join(RELATIONSHIP_TERMS) + r")\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b",
+    re.IGNORECASE
+)
+
+
 def detect_relatives_and_contacts(text: str) -> List[PHIEntity]:
     """
     Detect mentions of relatives and contacts in clinical notes.
@@ -213,21 +250,7 @@ def detect_relatives_and_contacts(text: str) -> List[PHIEntity]:
     """
     entities = []
     
-    # List of relationship terms
-    relationships = [
-        "wife", "husband", "spouse", "partner", 
-        "son", "daughter", "child", "children",
-        "mother", "father", "parent", "guardian",
-        "sister", "brother", "sibling",
-        "aunt", "uncle", "cousin",
-        "grandmother", "grandfather", "grandparent",
-        "grandson", "granddaughter", "grandchild"
-    ]
-    
-    # Create pattern to match relationship followed by capitalized name
-    pattern = r"\b(" + "|".join(relationships) + r")\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b"
-    
-    for match in re.finditer(pattern, text, re.IGNORECASE):
+    for match in RELATIVE_NAME_PATTERN.finditer(text):
         # Extract just the name part, not the relationship
         name_start = match.start(2)
         name_end = match.end(2)
@@ -244,6 +267,10 @@ def detect_relatives_and_contacts(text: str) -> List[PHIEntity]:
     return entities
 
 
+# "XX-year-old" or "XX year old"
+AGE_PATTERN = re.compile(r"\b(\d{2,3})[\s-](?:years?[\s-]old|y\.?o\.?|years?[\s-]of[\s-]age)\b", re.IGNORECASE)
+
+
 def detect_ages_over_89(text: str) -> List[PHIEntity]:
     """
     Detect ages ≥ 89 in clinical notes, which require special handling per HIPAA.
@@ -256,10 +283,7 @@ def detect_ages_over_89(text: str) -> List[PHIEntity]:
     """
     entities = []
     
-    # Pattern for "XX-year-old" or "XX year old"
-    age_pattern = r"\b(\d{2,3})[\s-](?:years?[\s-]old|y\.?o\.?|years?[\s-]of[\s-]age)\b"
-    
-    for match in re.finditer(age_pattern, text, re.IGNORECASE):
+    for match in AGE_PATTERN.finditer(text):
         age = int(match.group(1))
         if age >= 90:  # HIPAA requires special handling for ages ≥ 90
             entities.append(PHIEntity(
@@ -273,6 +297,93 @@ def detect_ages_over_89(text: str) -> List[PHIEntity]:
     return entities
 
 
+# Vital sign patterns
+VITAL_SIGN_PATTERNS = [
+    r"\bBP\s+\d{2,3}/\d{2,3}\b",  # Blood pressure
+    r"\bHR\s+\d{2,3}\b",           # Heart rate
+    r"\bRR\s+\d{1,2}\b",           # Respiratory rate
+    r"\bT\s+\d{2}\.\d\b",          # Temperature
+    r"\bTemp\s+\d{2}\.\d\b",       # Temperature
+    r"\bO2\s+\d{1,3}%\b",          # Oxygen saturation
+    r"\bSPO2\s+\d{1,3}%\b",        # Oxygen saturation
+    r"\bWT\s+\d{1,3}\.\d\b",       # Weight
+    r"\bHT\s+\d{1,3}\b",           # Height
+    r"\bBMI\s+\d{1,2}\.\d\b",      # BMI
+]
+
+# Lab value patterns
+LAB_VALUE_PATTERNS = [
+    r"\bA1c\s+\d{1,2}\.\d%\b",     # Hemoglobin A1c
+    r"\bHbA1c\s+\d{1,2}\.\d%\b",   # Hemoglobin A1c
+    r"\bLDL\s+\d{1,3}\b",          # LDL cholesterol
+    r"\bHDL\s+\d{1,3}\b",          # HDL cholesterol
+    r"\bTSH\s+\d{1,2}\.\d{1,3}\b", # Thyroid stimulating hormone
+    r"\bWBC\s+\d{1,2}\.\d\b",      # White blood cell count
+    r"\bHGB\s+\d{1,2}\.\d\b",      # Hemoglobin
+    r"\bHCT\s+\d{1,2}\.\d\b",      # Hematocrit
+    r"\bPLT\s+\d{1,3}\b",          # Platelet count
+    r"\bCR\s+\d{1,2}\.\d{1,2}\b",  # Creatinine
+    r"\bBUN\s+\d{1,2}\b",          # Blood urea nitrogen
+    r"\bNA\s+\d{3}\b",             # Sodium
+    r"\bK\s+\d{1,2}\.\d\b",        # Potassium
+    r"\bGLU\s+\d{1,3}\b",          # Glucose
+]
+
+# Medication dose patterns
+MEDICATION_DOSE_PATTERNS = [
+    r"\b\d{1,3}(?:\.\d+)?\s*mg\b",           # Milligrams
+    r"\b\d{1,3}(?:\.\d+)?\s*mcg\b",          # Micrograms
+    r"\b\d{1,3}(?:\.\d+)?\s*units?\b",       # Units
+    r"\b\d{1,3}(?:\.\d+)?\s*ml\b",           # Milliliters
+    r"\b\d{1,3}(?:\.\d+)?\s*cc\b",           # Cubic centimeters
+    r"\b\d{1,3}(?:\.\d+)?\s*drops?\b",       # Drops
+    r"\b\d{1,3}(?:\.\d+)?\s*tablets?\b",     # Tablets
+    r"\b\d{1,3}(?:\.\d+)?\s*capsules?\b",    # Capsules
+    r"\b\d{1,3}(?:\.\d+)?\s*g\b",            # Grams
+    r"\b\d{1,3}(?:\.\d+)?\s*kg\b",           # Kilograms
+    r"\b\d{1,3}(?:\.\d+)?\s*mmol\b",         # Millimoles
+    r"\b\d{1,3}(?:\.\d+)?\s*mEq\b",          # Milliequivalents
+    r"\b\d{1,3}(?:\.\d+)?\s*µg\b",           # Micrograms (Unicode)
+    r"\b\d{1,3}(?:\.\d+)?\s*IU\b",           # International Units
+    r"\b\d{1,3}(?:\.\d+)?\s*mIU\b",          # Milli-International Units
+    r"\b\d{1,3}(?:\.\d+)?\s*%\b",            # Percentage
+    # Common medication context patterns
+    r"(?:Metoprolol|Aspirin|Atorvastatin|Clopidogrel|Lisinopril|Amlodipine|Furosemide|Warfarin)\s+\d{1,3}(?:\.\d+)?\s*mg",
+    r"(?:succinate|tartrate|maleate|hydrochloride)\s+\d{1,3}(?:\.\d+)?\s*mg",
+    r"\b\d{1,3}(?:\.\d+)?\s*mg\s+PO\b",      # Oral medications
+    r"\b\d{1,3}(?:\.\d+)?\s*mg\s+IV\b",      # IV medications
+    r"\b\d{1,3}(?:\.\d+)?\s*mg\s+(?:daily|BID|TID|QID|qhs|q\d+h)\b", # With frequency
+]
+
+# Medical term patterns (common medical abbreviations and terms)
+MEDICAL_TERM_PATTERNS = [
+    r"\bNSTEMI\b",                 # Non-ST elevation myocardial infarction
+    r"\bSTEMI\b",                  # ST elevation myocardial infarction
+    r"\bCABG\b",                   # Coronary artery bypass graft
+    r"\bMI\b",                     # Myocardial infarction
+    r"\bCHF\b",                    # Congestive heart failure
+    r"\bCOPD\b",                   # Chronic obstructive pulmonary disease
+    r"\bDM\b",                     # Diabetes mellitus
+    r"\bHTN\b",                    # Hypertension
+    r"\bCAD\b",                    # Coronary artery disease
+    r"\bAFib\b",                   # Atrial fibrillation
+    r"\bPOD\b",                    # Post-operative day
+    r"\bPO\b",                     # Per os (by mouth)
+    r"\bIV\b",                     # Intravenous
+    r"\bIM\b",                     # Intramuscular
+    r"\bSC\b",                     # Subcutaneous
+]
+
+# All of the above as one alternation: a single scan answers "does any pattern match"
+CLINICAL_MEASUREMENT_PATTERN = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in VITAL_SIGN_PATTERNS + LAB_VALUE_PATTERNS + MEDICATION_DOSE_PATTERNS + MEDICAL_TERM_PATTERNS
+    ),
+    re.IGNORECASE
+)
+
+
 def is_clinical_measurement(text: str) -> bool:
     """
     Check if text represents a clinical measurement that should not be redacted.
@@ -283,90 +394,14 @@ def is_clinical_measurement(text: str) -> bool:
     Returns:
         True if the text is a clinical measurement, False otherwise
     """
-    # Vital sign patterns
-    vital_patterns = [
-        r"\bBP\s+\d{2,3}/\d{2,3}\b",  # Blood pressure
-        r"\bHR\s+\d{2,3}\b",           # Heart rate
-        r"\bRR\s+\d{1,2}\b",           # Respiratory rate
-        r"\bT\s+\d{2}\.\d\b",          # Temperature
-        r"\bTemp\s+\d{2}\.\d\b",       # Temperature
-        r"\bO2\s+\d{1,3}%\b",          # Oxygen saturation
-        r"\bSPO2\s+\d{1,3}%\b",        # Oxygen saturation
-        r"\bWT\s+\d{1,3}\.\d\b",       # Weight
-        r"\bHT\s+\d{1,3}\b",           # Height
-        r"\bBMI\s+\d{1,2}\.\d\b",      # BMI
-    ]
-    
-    # Lab value patterns
-    lab_patterns = [
-        r"\bA1c\s+\d{1,2}\.\d%\b",     # Hemoglobin A1c
-        r"\bHbA1c\s+\d{1,2}\.\d%\b",   # Hemoglobin A1c
-        r"\bLDL\s+\d{1,3}\b",          # LDL cholesterol
-        r"\bHDL\s+\d{1,3}\b",          # HDL cholesterol
-        r"\bTSH\s+\d{1,2}\.\d{1,3}\b", # Thyroid stimulating hormone
-        r"\bWBC\s+\d{1,2}\.\d\b",      # White blood cell count
-        r"\bHGB\s+\d{1,2}\.\d\b",      # Hemoglobin
-        r"\bHCT\s+\d{1,2}\.\d\b",      # Hematocrit
-        r"\bPLT\s+\d{1,3}\b",          # Platelet count
-        r"\bCR\s+\d{1,2}\.\d{1,2}\b",  # Creatinine
-        r"\bBUN\s+\d{1,2}\b",          # Blood urea nitrogen
-        r"\bNA\s+\d{3}\b",             # Sodium
-        r"\bK\s+\d{1,2}\.\d\b",        # Potassium
-        r"\bGLU\s+\d{1,3}\b",          # Glucose
-    ]
-    
-    # Medication dose patterns
-    medication_patterns = [
-        r"\b\d{1,3}(?:\.\d+)?\s*mg\b",           # Milligrams
-        r"\b\d{1,3}(?:\.\d+)?\s*mcg\b",          # Micrograms
-        r"\b\d{1,3}(?:\.\d+)?\s*units?\b",       # Units
-        r"\b\d{1,3}(?:\.\d+)?\s*ml\b",           # Milliliters
-        r"\b\d{1,3}(?:\.\d+)?\s*cc\b",           # Cubic centimeters
-        r"\b\d{1,3}(?:\.\d+)?\s*drops?\b",       # Drops
-        r"\b\d{1,3}(?:\.\d+)?\s*tablets?\b",     # Tablets
-        r"\b\d{1,3}(?:\.\d+)?\s*capsules?\b",    # Capsules
-        r"\b\d{1,3}(?:\.\d+)?\s*g\b",            # Grams
-        r"\b\d{1,3}(?:\.\d+)?\s*kg\b",           # Kilograms
-        r"\b\d{1,3}(?:\.\d+)?\s*mmol\b",         # Millimoles
-        r"\b\d{1,3}(?:\.\d+)?\s*mEq\b",          # Milliequivalents
-        r"\b\d{1,3}(?:\.\d+)?\s*µg\b",           # Micrograms (Unicode)
-        r"\b\d{1,3}(?:\.\d+)?\s*IU\b",           # International Units
-        r"\b\d{1,3}(?:\.\d+)?\s*mIU\b",          # Milli-International Units
-        r"\b\d{1,3}(?:\.\d+)?\s*%\b",            # Percentage
-        # Common medication context patterns
-        r"(?:Metoprolol|Aspirin|Atorvastatin|Clopidogrel|Lisinopril|Amlodipine|Furosemide|Warfarin)\s+\d{1,3}(?:\.\d+)?\s*mg",
-        r"(?:succinate|tartrate|maleate|hydrochloride)\s+\d{1,3}(?:\.\d+)?\s*mg",
-        r"\b\d{1,3}(?:\.\d+)?\s*mg\s+PO\b",      # Oral medications
-        r"\b\d{1,3}(?:\.\d+)?\s*mg\s+IV\b",      # IV medications
-        r"\b\d{1,3}(?:\.\d+)?\s*mg\s+(?:daily|BID|TID|QID|qhs|q\d+h)\b", # With frequency
-    ]
-    
-    # Medical term patterns (common medical abbreviations and terms)
-    medical_term_patterns = [
-        r"\bNSTEMI\b",                 # Non-ST elevation myocardial infarction
-        r"\bSTEMI\b",                  # ST elevation myocardial infarction
-        r"\bCABG\b",                   # Coronary artery bypass graft
-        r"\bMI\b",                     # Myocardial infarction
-        r"\bCHF\b",                    # Congestive heart failure
-        r"\bCOPD\b",                   # Chronic obstructive pulmonary disease
-        r"\bDM\b",                     # Diabetes mellitus
-        r"\bHTN\b",                    # Hypertension
-        r"\bCAD\b",                    # Coronary artery disease
-        r"\bAFib\b",                   # Atrial fibrillation
-        r"\bPOD\b",                    # Post-operative day
-        r"\bPO\b",                     # Per os (by mouth)
-        r"\bIV\b",                     # Intravenous
-        r"\bIM\b",                     # Intramuscular
-        r"\bSC\b",                     # Subcutaneous
-    ]
-    
-    # Check if text matches any of the patterns
-    all_patterns = vital_patterns + lab_patterns + medication_patterns + medical_term_patterns
-    for pattern in all_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    
-    return False
+    return CLINICAL_MEASUREMENT_PATTERN.search(text) is not None
+
+
+# 8+ digit numbers (increased threshold to avoid single digits)
+LONG_NUMBER_PATTERN = re.compile(r"\b\d{8,}\b")
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+PHONE_NUMBER_PATTERN = re.compile(r'\(\d{3}\)\s*\d{3}-\d{4}')
+ZIP_PLUS_FOUR_PATTERN = re.compile(r'\b\d{5}-\d{4}\b')
 
 
 def detect_long_numeric_ids(text: str, existing_entities: List[PHIEntity]) -> List[PHIEntity]:
@@ -382,23 +417,17 @@ def detect_long_numeric_ids(text: str, existing_entities: List[PHIEntity]) -> Li
     """
     entities = []
     
-    # Pattern for 8+ digit numbers (increased threshold to avoid single digits)
-    long_number_pattern = r"\b\d{8,}\b"
-    
-    # Create a set of spans that are already covered by existing entities
-    covered_spans = set()
+    # Mark the characters already covered by existing entities (one byte per character)
+    covered = bytearray(len(text))
     for entity in existing_entities:
-        for i in range(entity.start, entity.end):
-            covered_spans.add(i)
+        end = min(entity.end, len(text))
+        if entity.start < end:
+            covered[entity.start:end] = b"\x01" * (end - entity.start)
     
     # Find long numbers
-    for match in re.finditer(long_number_pattern, text):
+    for match in LONG_NUMBER_PATTERN.finditer(text):
         # Check if this span overlaps with any existing entity
-        overlapped = False
-        for i in range(match.start(), match.end()):
-            if i in covered_spans:
-                overlapped = True
-                break
+        overlapped = 1 in covered[match.start():match.end()]
         
         if not overlapped:
             # Check if it's a clinical measurement (which should not be redacted)
@@ -409,13 +438,13 @@ def detect_long_numeric_ids(text: str, existing_entities: List[PHIEntity]) -> Li
             # Additional context checks to avoid false positives
             if not is_clinical_measurement(context):
                 # Skip if it's part of a date (YYYY format)
-                if re.search(r'\b(19|20)\d{2}\b', match.group()):
+                if YEAR_PATTERN.search(match.group()):
                     continue
                 # Skip if it's part of a phone number
-                if re.search(r'\(\d{3}\)\s*\d{3}-\d{4}', context):
+                if PHONE_NUMBER_PATTERN.search(context):
                     continue
                 # Skip if it's part of a ZIP code
-                if re.search(r'\b\d{5}-\d{4}\b', context):
+                if ZIP_PLUS_FOUR_PATTERN.search(context):
                     continue
                 
                 entities.append(PHIEntity(
@@ -429,6 +458,25 @@ def detect_long_numeric_ids(text: str, existing_entities: List[PHIEntity]) -> Li
     return entities
 
 
+# Common clinical note headers, as one alternation gating the clinical detectors
+CLINICAL_NOTE_HEADERS = [
+    r"patient\s*(?:name|id|information|record)",
+    r"medical\s*record",
+    r"admission|discharge",
+    r"diagnosis",
+    r"procedure",
+    r"hospital\s*course",
+    r"medications",
+    r"follow-?up",
+    r"clinical\s*note",
+    r"assessment",
+    r"plan",
+    r"history\s*(?:of|and)\s*physical",
+    r"progress\s*note"
+]
+CLINICAL_NOTE_PATTERN = re.compile("|".join(f"(?:{header})" for header in CLINICAL_NOTE_HEADERS), re.IGNORECASE)
+
+
 def detect_clinical_phi(text: str, existing_entities: List[PHIEntity] = None) -> List[PHIEntity]:
     """
     Detect PHI in clinical notes using specialized patterns.
@@ -447,27 +495,7 @@ def detect_clinical_phi(text: str, existing_entities: List[PHIEntity] = None) ->
     
     # Check if this is a clinical note by looking for common clinical note headers
     # This helps avoid applying clinical patterns to non-clinical text
-    is_clinical_note = False
-    clinical_headers = [
-        r"patient\s*(?:name|id|information|record)",
-        r"medical\s*record",
-        r"admission|discharge",
-        r"diagnosis",
-        r"procedure",
-        r"hospital\s*course",
-        r"medications",
-        r"follow-?up",
-        r"clinical\s*note",
-        r"assessment",
-        r"plan",
-        r"history\s*(?:of|and)\s*physical",
-        r"progress\s*note"
-    ]
-    
-    for header in clinical_headers:
-        if re.search(header, text, re.IGNORECASE):
-            is_clinical_note = True
-            break
+    is_clinical_note = CLINICAL_NOTE_PATTERN.search(text) is not None
     
     # Only apply clinical detectors if this appears to be a clinical note
     if is_clinical_note:
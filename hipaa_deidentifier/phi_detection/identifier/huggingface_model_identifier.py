@@ -13,6 +13,7 @@ It focuses on identifiers that require medical domain knowledge:
 - Medical-specific identifiers
 """
 
+import os
 from typing import Dict, List, Optional
 
 from hipaa_deidentifier.models.phi_entity import PHIEntity
@@ -63,6 +64,10 @@ class HFDeidentifier:
         # OTHER_ID removed as per user request
     }
     
+    # Characters per pipeline chunk, and overlap between consecutive chunks of a long paragraph
+    CHUNK_SIZE = 500
+    CHUNK_OVERLAP = 100
+    
     # Threshold map for different confidence levels
     # Based on the inspiration code's threshold values
     THRESHOLD_MAP = {
@@ -86,7 +91,9 @@ class HFDeidentifier:
                  hf_model: str = "obi/deid_bert_i2b2", 
                  device: int = -1,
                  config: Optional[Dict] = None,
-                 threshold_level: str = "standard"):
+                 threshold_level: str = "standard",
+                 use_fp16: Optional[bool] = None,
+                 quantize_int8: Optional[bool] = None):
         """
         Initialize the Hugging Face transformer-based de-identifier.
         
@@ -95,6 +102,8 @@ class HFDeidentifier:
             device: Device to run inference on (-1 for CPU, 0+ for specific GPU)
             config: Configuration dictionary
             threshold_level: Confidence threshold level (standard, high, very_high, recall_99.5, recall_99.7)
+            use_fp16: Run the model in half precision on GPU (None uses models.use_fp16 from config)
+            quantize_int8: Run the model with int8 dynamic quantization on CPU (None uses models.quantize_int8 from config)
         """
         self.config = config or {}
         
@@ -102,9 +111,21 @@ class HFDeidentifier:
         self.device = device
         self.device_name = "cpu" if device < 0 else f"cuda:{device}"
         
+        # CPU inference threads (DEID_THREADS overrides config; unset keeps torch's default)
+        num_threads = os.getenv("DEID_THREADS", self.config.get("models", {}).get("num_threads"))
+        if num_threads and device < 0:
+            model_cache.configure_cpu_threads(int(num_threads))
+        
         # Load Hugging Face model and pipeline using model_cache
         self.hf_model_name = hf_model
-        self.hf_pipeline = model_cache.get_hf_pipeline(hf_model, device)
+        if use_fp16 is None:
+            use_fp16 = self.config.get("models", {}).get("use_fp16", False)
+        if quantize_int8 is None:
+            quantize_int8 = self.config.get("models", {}).get("quantize_int8", False)
+        self.hf_pipeline = model_cache.get_hf_pipeline(hf_model, device, use_fp16=use_fp16, quantize_int8=quantize_int8)
+        
+        # Number of chunks per forward pass for long documents (DEID_BATCH overrides config)
+        self.batch_size = int(os.getenv("DEID_BATCH", self.config.get("models", {}).get("batch_size", 32)))
         
         # Get targeted identifiers from config or use default
         # Check in detect.hf_identifiers first, then fall back to root hf_identifiers
@@ -136,71 +157,109 @@ class HFDeidentifier:
         Returns:
             List of detected PHI entities
         """
-        entities = []
+        return self.detect_batch([text])[0]
+    
+    def detect_batch(self, texts: List[str]) -> List[List[PHIEntity]]:
+        """
+        Detect medical-specific PHI entities in several texts at once.
+        
+        The chunks of all texts go through the HF pipeline together in batches of
+        self.batch_size, so many short notes cost a few forward passes instead of one each.
+        
+        Args:
+            texts: The texts to analyze
+            
+        Returns:
+            One list of detected PHI entities per input text, in input order
+        """
+        results = [[] for _ in texts]
         
         # Use the HF pipeline from model_cache
         try:
-            # Handle long texts by chunking them to avoid tensor size issues
-            if len(text) > 500:
-                # Improved chunking with overlap to handle entities at boundaries
-                chunk_size = 500
-                overlap = 100
-                offset = 0
-                
-                # Split by newlines first to preserve document structure
-                paragraphs = text.split('\n')
-                for paragraph in paragraphs:
-                    # Skip empty paragraphs
-                    if not paragraph.strip():
-                        offset += len(paragraph) + 1  # +1 for the newline
-                        continue
-                    
-                    # If paragraph is short, process it directly
-                    if len(paragraph) <= chunk_size:
-                        hf_results = self.hf_pipeline(paragraph)
-                        hf_entities = self._process_hf_results(hf_results, offset)
-                        entities.extend(hf_entities)
-                        offset += len(paragraph) + 1  # +1 for the newline
-                    else:
-                        # Process long paragraph with overlapping chunks
-                        para_offset = 0
-                        while para_offset < len(paragraph):
-                            end = min(para_offset + chunk_size, len(paragraph))
-                            chunk = paragraph[para_offset:end]
-                            
-                            # Process the chunk
-                            hf_results = self.hf_pipeline(chunk)
-                            
-                            # For overlapping regions, only keep entities fully within the non-overlapping part
-                            # except for the last chunk
-                            if para_offset > 0 and end < len(paragraph):
-                                filtered_results = [
-                                    r for r in hf_results 
-                                    if r["start"] >= overlap and r["end"] <= len(chunk)
-                                ]
-                                hf_entities = self._process_hf_results(filtered_results, offset + para_offset)
-                            else:
-                                hf_entities = self._process_hf_results(hf_results, offset + para_offset)
-                                
-                            entities.extend(hf_entities)
-                            
-                            # Move to next chunk with overlap
-                            para_offset = end - overlap if end < len(paragraph) else len(paragraph)
-                        
-                        offset += len(paragraph) + 1  # +1 for the newline
+            # Collect (text index, chunk, base offset, owned start range) for every text
+            chunks = []
+            for index, text in enumerate(texts):
+                chunks.extend((index, *chunk) for chunk in self._chunk_text(text))
+            
+            # Run all chunks through the pipeline in batches
+            if len(chunks) == 1:
+                batch_results = [self.hf_pipeline(chunks[0][1])]
+            elif chunks:
+                batch_results = self.hf_pipeline([chunk for _, chunk, _, _, _ in chunks], batch_size=self.batch_size)
             else:
-                # Process short text directly
-                hf_results = self.hf_pipeline(text)
-                entities = self._process_hf_results(hf_results)
+                batch_results = []
+            
+            for (index, chunk, chunk_offset, keep_from, keep_to), hf_results in zip(chunks, batch_results):
+                # Overlapping windows see the same entity twice; keep it only in the window that owns its start
+                hf_results = [r for r in hf_results if keep_from <= r["start"] < keep_to]
+                results[index].extend(self._process_hf_results(hf_results, chunk_offset))
         except Exception as e:
             print(f"Warning: Error in Hugging Face detection: {e}")
             
         # Add specialized detection for ages over 89
         if "AGE_OVER_89" in self.target_identifiers:
-            age_entities = detect_ages_over_89(text)
-            entities.extend(age_entities)
+            for index, text in enumerate(texts):
+                results[index].extend(detect_ages_over_89(text))
         
-        return entities
+        return results
+    
+    def _chunk_text(self, text: str) -> List[tuple]:
+        """
+        Split text into pipeline-sized chunks to avoid tensor size issues.
+        
+        Args:
+            text: The text to split
+            
+        Returns:
+            List of (chunk, base offset, keep_from, keep_to) tuples; only entities starting
+            in [keep_from, keep_to) of a chunk belong to it, so overlapping windows of a
+            long paragraph split their shared region at its midpoint
+        """
+        # Process short text directly
+        if len(text) <= self.CHUNK_SIZE:
+            return [(text, 0, 0, len(text) + 1)]
+        
+        # Improved chunking with overlap to handle entities at boundaries
+        chunk_size = self.CHUNK_SIZE
+        overlap = self.CHUNK_OVERLAP
+        offset = 0
+        chunks = []
+        
+        # Split by newlines first to preserve document structure
+        paragraphs = text.split('\n')
+        for paragraph in paragraphs:
+            # Skip empty paragraphs
+            if not paragraph.strip():
+                offset += len(paragraph) + 1  # +1 for the newline
+                continue
+            
+            # If paragraph is short, process it directly
+            if len(paragraph) <= chunk_size:
+                chunks.append((paragraph, offset, 0, len(paragraph) + 1))
+                offset += len(paragraph) + 1  # +1 for the newline
+            else:
+                # Process long paragraph with overlapping chunks
+                para_offset = 0
+                while para_offset < len(paragraph):
+                    end = min(para_offset + chunk_size, len(paragraph))
+                    
+                    # End the window on a space so it does not cut a name or ID in half
+                    if end < len(paragraph):
+                        split = paragraph.rfind(' ', para_offset + overlap + 1, end)
+                        if split != -1:
+                            end = split
+                    
+                    # Each window owns entity starts up to the middle of its overlaps with its neighbours
+                    keep_from = overlap // 2 if para_offset > 0 else 0
+                    keep_to = end - para_offset - overlap // 2 if end < len(paragraph) else end - para_offset + 1
+                    chunks.append((paragraph[para_offset:end], offset + para_offset, keep_from, keep_to))
+                    
+                    # Move to next chunk with overlap
+                    para_offset = end - overlap if end < len(paragraph) else len(paragraph)
+                
+                offset += len(paragraph) + 1  # +1 for the newline
+        
+        return chunks
     
     def _process_hf_results(self, results: List[dict], offset: int = 0) -> List[PHIEntity]:
         """
@@ -282,9 +341,8 @@ class HFDeidentifier:
                     category=category,
                     confidence=float(result["score"]),
                     text=word,
+                    source="hf",  # Set source for tracking
                 )
-                # Set source for tracking
-                entity.source = "hf"
                 entities.append(entity)
         
         return entities
@@ -7,9 +7,11 @@ It focuses on identifiers with clear patterns like phone numbers, emails, SSNs,
 """
 
 import re
+from collections import OrderedDict
 from typing import Dict, List, Optional, Set
 
 from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer.nlp_engine import NlpArtifacts
 
 from hipaa_deidentifier.models.phi_entity import PHIEntity
 from hipaa_deidentifier.phi_detection.recognizer.custom_recognizers import MedicalRecordNumberRecognizer, EncounterIdentifierRecognizer, AgeOver89Recognizer
@@ -90,6 +92,9 @@ class PresidioDeidentifier:
         "NAME", "LOCATION", "ORGANIZATION", "DATE"
     }
     
+    # Number of recently analyzed texts whose spaCy results are kept for reuse
+    NLP_ARTIFACTS_CACHE_SIZE = 32
+    
     def __init__(self, config: Optional[Dict] = None):
         """
         Initialize the Presidio-based de-identifier.
@@ -105,6 +110,9 @@ class PresidioDeidentifier:
         # Initialize the text normalizer (Stage 0)
         self.text_normalizer = Stage0Normalizer()
         
+        # spaCy results per normalized text (LRU), so re-analyzing the same note skips spaCy
+        self._nlp_artifacts_cache = OrderedDict()
+        
         # Get targeted identifiers from config or use default
         # Check in detect.presidio_identifiers first, then fall back to root presidio_identifiers
         detect_config = self.config.get("detect", {})
@@ -132,6 +140,11 @@ class PresidioDeidentifier:
         # Get the registry and add custom healthcare recognizers
         registry = analyzer.registry
         
+        # The analyzer is shared per spaCy model; register our recognizers on it only once
+        # so later instances don't stack duplicates that every analyze call would run
+        if any(isinstance(recognizer, EnhancedMRNRecognizer) for recognizer in registry.recognizers):
+            return analyzer
+        
         # Add basic medical recognizers
         # Add enhanced MRN recognizer first (higher priority)
         registry.add_recognizer(EnhancedMRNRecognizer())
@@ -210,6 +223,41 @@ class PresidioDeidentifier:
         """
         # Stage 0: Normalize text while maintaining character mapping
         stage0_result = self.text_normalizer.stage0_normalize_and_candidates(text)
+        nlp_artifacts = self._get_nlp_artifacts(stage0_result["normalized_text"])
+        
+        return self._detect_normalized(text, stage0_result, nlp_artifacts)
+    
+    def detect_batch(self, texts: List[str]) -> List[List[PHIEntity]]:
+        """
+        Detect structured PHI entities in several texts, running spaCy over them with nlp.pipe.
+        
+        Args:
+            texts: The texts to analyze
+            
+        Returns:
+            One list of detected PHI entities per text, in input order
+        """
+        # Stage 0: Normalize text while maintaining character mapping
+        stage0_results = [self.text_normalizer.stage0_normalize_and_candidates(text) for text in texts]
+        nlp_artifacts = self._get_nlp_artifacts_batch([result["normalized_text"] for result in stage0_results])
+        
+        return [
+            self._detect_normalized(text, stage0_result, artifacts)
+            for text, stage0_result, artifacts in zip(texts, stage0_results, nlp_artifacts)
+        ]
+    
+    def _detect_normalized(self, text: str, stage0_result: Dict, nlp_artifacts: NlpArtifacts) -> List[PHIEntity]:
+        """
+        Run Presidio and the post-processing detectors on an already normalized text.
+        
+        Args:
+            text: The original text
+            stage0_result: Stage 0 normalization result for the text
+            nlp_artifacts: spaCy NLP artifacts for the normalized text
+            
+        Returns:
+            List of detected PHI entities
+        """
         normalized_text = stage0_result["normalized_text"]
         project_fn = stage0_result["project_fn"]
         
@@ -221,7 +269,8 @@ class PresidioDeidentifier:
             text=normalized_text,
             entities=presidio_entity_types,
             language="en",
-            score_threshold=self.threshold
+            score_threshold=self.threshold,
+            nlp_artifacts=nlp_artifacts
         )
         
         # Convert Presidio results to PHI entities
@@ -239,10 +288,9 @@ class PresidioDeidentifier:
                 end=original_end,
                 category=category,
                 confidence=result.score,
-                text=text[original_start:original_end]
+                text=text[original_start:original_end],
+                source="presidio"  # Set source for tracking
             )
-            # Set source for tracking
-            entity.source = "presidio"
             entities.append(entity)
         
         # Note: spaCy detection is already integrated into Presidio's built-in recognizers
@@ -263,6 +311,54 @@ class PresidioDeidentifier:
         
         return entities
     
+    def _get_nlp_artifacts(self, text: str) -> NlpArtifacts:
+        """
+        Get the spaCy NLP artifacts for a text, reusing them for recently seen texts.
+        
+        Args:
+            text: The (normalized) text to process
+            
+        Returns:
+            The NLP artifacts Presidio's recognizers consume
+        """
+        nlp_artifacts = self._nlp_artifacts_cache.get(text)
+        if nlp_artifacts is not None:
+            self._nlp_artifacts_cache.move_to_end(text)
+            return nlp_artifacts
+        
+        nlp_artifacts = self.analyzer.nlp_engine.process_text(text, "en")
+        self._nlp_artifacts_cache[text] = nlp_artifacts
+        if len(self._nlp_artifacts_cache) > self.NLP_ARTIFACTS_CACHE_SIZE:
+            self._nlp_artifacts_cache.popitem(last=False)
+        return nlp_artifacts
+    
+    def _get_nlp_artifacts_batch(self, texts: List[str]) -> List[NlpArtifacts]:
+        """
+        Get the spaCy NLP artifacts for several texts, piping the uncached ones through spaCy together.
+        
+        Args:
+            texts: The (normalized) texts to process
+            
+        Returns:
+            The NLP artifacts for each text, in input order
+        """
+        artifacts_by_text = {}
+        for text in texts:
+            cached = self._nlp_artifacts_cache.get(text)
+            if cached is not None:
+                artifacts_by_text[text] = cached
+        
+        # One nlp.pipe pass over the distinct texts not seen recently
+        missing = [text for text in dict.fromkeys(texts) if text not in artifacts_by_text]
+        if missing:
+            for text, (_, nlp_artifacts) in zip(missing, self.analyzer.nlp_engine.process_batch(missing, "en")):
+                artifacts_by_text[text] = nlp_artifacts
+                self._nlp_artifacts_cache[text] = nlp_artifacts
+            while len(self._nlp_artifacts_cache) > self.NLP_ARTIFACTS_CACHE_SIZE:
+                self._nlp_artifacts_cache.popitem(last=False)
+        
+        return [artifacts_by_text[text] for text in texts]
+    
     def _detect_fax_numbers(self, text: str) -> List[PHIEntity]:
         """
         Detect FAX numbers with explicit fax labels.
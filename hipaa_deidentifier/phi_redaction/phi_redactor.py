@@ -107,7 +107,8 @@ class PHIRedactor:
         # Pre-process to identify clinical measurements that should not be redacted
         self._identify_clinical_measurements(text)
         
-        # Apply transformations
+        # Select the entities to replace and resolve their final category and rule
+        resolved = []
         for entity in sorted_entities:
             # Check if this span overlaps with any already replaced span
             overlapping = False
@@ -120,15 +121,29 @@ class PHIRedactor:
             if overlapping:
                 continue
                 
+            # Get the original text of the entity
+            original_text = text[entity.start:entity.end]
+            
             # Skip if this is a clinical measurement that should not be redacted
-            if self._is_clinical_measurement(text[entity.start:entity.end]):
+            if self._is_clinical_measurement(original_text):
                 continue
             
-            # Get the original text of the entity
-            original_text = text[entity.start:entity.end]
+            resolved.append((entity, original_text, self._resolve_rule(entity.category, original_text)))
             
-            # Apply the appropriate transformation
-            replacement = self._apply_transformation(entity.category, original_text, patient_id)
+            # Track this replaced span
+            replaced_spans.append((entity.start, entity.end))
+        
+        # Hash every pseudonym the replacements below will look up in one batch
+        self.pseudonym_manager.get_pseudonyms_bulk([
+            (original_text, category, patient_id)
+            for _, original_text, (category, rule, replacement) in resolved
+            if replacement is None and rule in ("hash", "pseudonym") and len(original_text.strip()) >= 4
+        ])
+        
+        # Apply transformations
+        for entity, original_text, (category, rule, replacement) in resolved:
+            if replacement is None:
+                replacement = self._apply_rule(category, rule, original_text, patient_id)
             
             # Replace the entity in the text
             redacted_text = (
@@ -137,22 +152,19 @@ class PHIRedactor:
                 redacted_text[entity.end:]
             )
             
-            # Track this replaced span
-            replaced_spans.append((entity.start, entity.end))
-            
         return redacted_text
     
-    def _apply_transformation(self, category: str, text: str, patient_id: Optional[str] = None) -> str:
+    def _resolve_rule(self, category: str, text: str) -> Tuple[str, str, Optional[str]]:
         """
-        Applies the appropriate transformation to a PHI entity.
+        Resolves the final category and transformation rule for a PHI entity.
         
         Args:
-            category: The category of PHI
+            category: The detected category of PHI
             text: The text to transform
-            patient_id: Optional patient identifier for consistent transformations
             
         Returns:
-            The transformed text
+            Tuple of (category, rule, replacement); replacement is set when a special
+            case decides the output without applying the rule, otherwise None
         """
         # Get the rule for this category, or use the default
         rules = self.config.get("transform", {}).get("rules", {})
@@ -161,11 +173,11 @@ class PHIRedactor:
         # Fix issue #1: Header/Section Title Corruption
         # Don't transform common section headers or clinical terms
         if self._is_common_header(text) or self._is_clinical_term(text):
-            return text
+            return category, rule, text
             
         # Special handling for the full note header (Mercy River Medical Center — Outpatient Progress Note)
         if "Medical Center" in text and "Progress Note" in text:
-            return text
+            return category, rule, text
         
         # Fix issue #2: Wrong PHI Categorization
         # Special handling for ZIP+4 codes
@@ -205,21 +217,36 @@ class PHIRedactor:
         if category == "DATE" and re.match(r'\d{1,2}/\d{1,2}', text) and len(text) <= 5:
             # This is likely a partial date (MM/DD) without the year
             # Check if there's a year nearby in the original text
-            return f"[REDACTED:DATE]"
+            return category, rule, "[REDACTED:DATE]"
             
         # Special handling for email addresses - keep as one unit
         if category == "EMAIL_ADDRESS" or (category == "URL" and "@" in text):
-            return f"[REDACTED:EMAIL_ADDRESS]"
+            return category, rule, "[REDACTED:EMAIL_ADDRESS]"
             
         # Special handling for URLs
         if category == "URL":
-            return f"[REDACTED:URL]"
+            return category, rule, "[REDACTED:URL]"
         
         # Fix issue #4: Hashes / Noise Injected
         # Skip short text that's likely a false positive
         if len(text.strip()) < 3 and category not in ["AGE", "AGE_OVER_89"]:
-            return text
+            return category, rule, text
+        
+        return category, rule, None
+    
+    def _apply_rule(self, category: str, rule: str, text: str, patient_id: Optional[str] = None) -> str:
+        """
+        Applies a resolved transformation rule to a PHI entity.
+        
+        Args:
+            category: The resolved category of PHI
+            rule: The resolved transformation rule
+            text: The text to transform
+            patient_id: Optional patient identifier for consistent transformations
             
+        Returns:
+            The transformed text
+        """
         # Apply the appropriate transformation
         if rule == "redact":
             return f"[REDACTED:{category}]"
@@ -57,6 +57,55 @@ def get_consistent_date_shift(salt: str, patient_id: Optional[str] = None) -> in
     return shift_days
 
 
+# Sentinel for cache lookups
+_MISSING = object()
+
+# Common date formats to try (from most specific to least specific)
+_DATE_FORMATS = [
+    # ISO format
+    "%Y-%m-%d",      # 2023-01-15
+    
+    # Common US formats
+    "%m/%d/%Y",      # 01/15/2023
+    "%m/%d/%y",      # 01/15/23
+    "%B %d, %Y",     # January 15, 2023
+    "%b %d, %Y",     # Jan 15, 2023
+    "%m-%d-%Y",      # 01-15-2023
+    "%m-%d-%y",      # 01-15-23
+    
+    # Common UK/European formats
+    "%d/%m/%Y",      # 15/01/2023
+    "%d/%m/%y",      # 15/01/23
+    "%d-%m-%Y",      # 15-01-2023
+    "%d-%m-%y",      # 15-01-23
+    "%d %B %Y",      # 15 January 2023
+    "%d %b %Y",      # 15 Jan 2023
+    
+    # Other common formats
+    "%Y/%m/%d",      # 2023/01/15
+    "%Y%m%d",        # 20230115
+]
+
+# Dates with time components, tried after the plain date formats
+_TIME_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",     # 2023-01-15 14:30:00
+    "%Y-%m-%d %H:%M",        # 2023-01-15 14:30
+    "%m/%d/%Y %H:%M:%S",     # 01/15/2023 14:30:00
+    "%m/%d/%Y %H:%M",        # 01/15/2023 14:30
+    "%d/%m/%Y %H:%M:%S",     # 15/01/2023 14:30:00
+    "%d/%m/%Y %H:%M",        # 15/01/2023 14:30
+]
+
+# Formats bucketed by input shape (original order kept within each bucket)
+_ALL_FORMATS = _DATE_FORMATS + _TIME_FORMATS
+_ALPHA_FORMATS = [f for f in _ALL_FORMATS if "%B" in f or "%b" in f]
+_SLASH_FORMATS = [f for f in _ALL_FORMATS if "/" in f and f not in _ALPHA_FORMATS]
+_DASH_FORMATS = [f for f in _ALL_FORMATS if "-" in f and "/" not in f and f not in _ALPHA_FORMATS]
+_COMPACT_FORMATS = ["%Y%m%d"]
+# Space-separated digits only: no strptime format fits, leave it to the fallback below
+_SPACE_FORMATS = []
+
+
 def parse_date(date_str: str) -> Tuple[Optional[datetime], Optional[str]]:
     """
     Parse a date string into a datetime object.
@@ -72,53 +121,30 @@ def parse_date(date_str: str) -> Tuple[Optional[datetime], Optional[str]]:
         
     # Strip any leading/trailing whitespace
     date_str = date_str.strip()
-    
-    # Common date formats to try (from most specific to least specific)
-    formats = [
-        # ISO format
-        "%Y-%m-%d",      # 2023-01-15
-        
-        # Common US formats
-        "%m/%d/%Y",      # 01/15/2023
-        "%m/%d/%y",      # 01/15/23
-        "%B %d, %Y",     # January 15, 2023
-        "%b %d, %Y",     # Jan 15, 2023
-        "%m-%d-%Y",      # 01-15-2023
-        "%m-%d-%y",      # 01-15-23
-        
-        # Common UK/European formats
-        "%d/%m/%Y",      # 15/01/2023
-        "%d/%m/%y",      # 15/01/23
-        "%d-%m-%Y",      # 15-01-2023
-        "%d-%m-%y",      # 15-01-23
-        "%d %B %Y",      # 15 January 2023
-        "%d %b %Y",      # 15 Jan 2023
-        
-        # Other common formats
-        "%Y/%m/%d",      # 2023/01/15
-        "%Y%m%d",        # 20230115
-    ]
-    
+
+    # Nothing below can match without a digit, or in fewer than 6 characters
+    n = len(date_str)
+    if n < 6 or not any(ch.isdigit() for ch in date_str):
+        return None, None
+
+    # Cheap prefilter: only try the strptime formats whose shape fits the input.
+    # Anything skipped here still goes through the regex fallback below.
+    if n > 32 or not date_str[0].isalnum():
+        bucket = []
+    elif not any(ch in date_str for ch in '-/ '):
+        # Without a separator only the compact YYYYMMDD form can match
+        bucket = _COMPACT_FORMATS if n == 8 and date_str.isdigit() else []
+    elif any(c.isalpha() for c in date_str):
+        bucket = _ALPHA_FORMATS
+    elif '/' in date_str:
+        bucket = _SLASH_FORMATS
+    elif '-' in date_str:
+        bucket = _DASH_FORMATS
+    else:
+        bucket = _SPACE_FORMATS
+
     # Try each format until one works
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt, fmt
-        except ValueError:
-            continue
-    
-    # Try to handle dates with time components
-    time_formats = [
-        # Date with time
-        "%Y-%m-%d %H:%M:%S",     # 2023-01-15 14:30:00
-        "%Y-%m-%d %H:%M",        # 2023-01-15 14:30
-        "%m/%d/%Y %H:%M:%S",     # 01/15/2023 14:30:00
-        "%m/%d/%Y %H:%M",        # 01/15/2023 14:30
-        "%d/%m/%Y %H:%M:%S",     # 15/01/2023 14:30:00
-        "%d/%m/%Y %H:%M",        # 15/01/2023 14:30
-    ]
-    
-    for fmt in time_formats:
+    for fmt in bucket:
         try:
             dt = datetime.strptime(date_str, fmt)
             return dt, fmt
@@ -198,9 +224,10 @@ def shift_date(date_str: str, days: int, patient_id: Optional[str] = None, salt:
         
         if match:
             parts = [match.group(1), match.group(2), match.group(3)]
+            matched = match.group(0)
             separators = [
-                date_str[len(match.group(1)):len(match.group(1))+1],
-                date_str[len(match.group(1))+len(match.group(2))+1:len(match.group(1))+len(match.group(2))+2]
+                matched[len(match.group(1)):len(match.group(1))+1],
+                matched[len(match.group(1))+len(match.group(2))+1:len(match.group(1))+len(match.group(2))+2]
             ]
             
             # Determine which part is year, month, day
@@ -222,7 +249,7 @@ def shift_date(date_str: str, days: int, patient_id: Optional[str] = None, salt:
     # Use the standard format
     try:
         return shifted.strftime(fmt)
-    except:
+    except ValueError:
         return date_str  # Return original if formatting fails
 
 
@@ -242,6 +269,7 @@ class DateShifter:
         self.salt = config.get("security", {}).get("salt", "default_salt")
         self.default_shift_days = get_date_shift_days_from_config(config)
         self.patient_shifts = {}  # Cache of patient-specific shift days
+        self.date_cache = {}  # Cache of shifted dates keyed by "date:patient"
         
     def get_shift_days(self, patient_id: Optional[str] = None) -> int:
         """
@@ -281,12 +309,9 @@ class DateShifter:
         cache_key = f"{date_str}:{patient_id or 'default'}"
         
         # Use cached value if available
-        if hasattr(self, 'date_cache') and cache_key in self.date_cache:
-            return self.date_cache[cache_key]
-            
-        # Initialize cache if not exists
-        if not hasattr(self, 'date_cache'):
-            self.date_cache = {}
+        cached = self.date_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
             
         # Get shift days and apply shift
         shift_days = self.get_shift_days(patient_id)
@@ -0,0 +1,45 @@
+"""
+JSON Output Utilities
+
+Provides functions for writing de-identification results as JSON, using the
+faster orjson encoder when it is installed.
+"""
+import json
+from typing import Any
+
+# Optional faster JSON encoder; falls back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json(path: str, data: Any) -> None:
+    """
+    Write data to a file as indented UTF-8 JSON.
+    
+    Args:
+        path: Path of the output file
+        data: JSON-serializable data to write
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def json_line(data: Any) -> str:
+    """
+    Serialize data as a single compact JSON line (without the newline).
+    
+    Args:
+        data: JSON-serializable data to serialize
+        
+    Returns:
+        The JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, ensure_ascii=False)
@@ -8,6 +8,7 @@ import json
 from typing import Optional, Dict, Any
 from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline as hf_pipeline
 import spacy
+import torch
 from transformers import logging as tf_logging
 
 # Reduce verbosity of transformers warnings
@@ -50,19 +51,31 @@ class ModelCache:
         
         return self._models[cache_key]
     
-    def get_hf_pipeline(self, model_name: str, device: int = -1) -> Any:
+    def get_hf_pipeline(self, model_name: str, device: int = -1, use_fp16: bool = False, quantize_int8: bool = False) -> Any:
         """
         Get or load a Hugging Face pipeline with caching.
         
         Args:
             model_name: Name of the Hugging Face model
             device: Device to run on
+            use_fp16: Load weights in half precision (only applied on a CUDA device)
+            quantize_int8: Dynamically quantize Linear layers to int8 (only applied on CPU)
             
         Returns:
             The loaded Hugging Face pipeline
         """
-        # Use model name only for cache key (device doesn't affect the model itself)
-        cache_key = f"hf_{model_name}"
+        # Half precision only pays off (and is only well supported) on GPU
+        use_fp16 = use_fp16 and device >= 0 and torch.cuda.is_available()
+        # Dynamic int8 quantization is the CPU counterpart (quantized kernels are CPU-only)
+        quantize_int8 = quantize_int8 and not use_fp16 and (device < 0 or not torch.cuda.is_available())
+        
+        # Use model name and precision for cache key (device doesn't affect the model itself)
+        if use_fp16:
+            cache_key = f"hf_{model_name}_fp16"
+        elif quantize_int8:
+            cache_key = f"hf_{model_name}_int8"
+        else:
+            cache_key = f"hf_{model_name}"
         
         if cache_key not in self._models:
             print(f"Loading Hugging Face model: {model_name}")
@@ -72,12 +85,19 @@ class ModelCache:
                 os.makedirs(cache_dir, exist_ok=True)
                 
                 # Load with explicit cache directory
+                model = AutoModelForTokenClassification.from_pretrained(
+                    model_name,
+                    cache_dir=cache_dir,
+                    torch_dtype=torch.float16 if use_fp16 else None
+                ).eval()
+                if quantize_int8:
+                    model = torch.ao.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                
                 self._models[cache_key] = hf_pipeline(
                     "token-classification",
-                    model=AutoModelForTokenClassification.from_pretrained(
-                        model_name,
-                        cache_dir=cache_dir
-                    ),
+                    model=model,
                     tokenizer=AutoTokenizer.from_pretrained(
                         model_name,
                         cache_dir=cache_dir
@@ -94,6 +114,21 @@ class ModelCache:
         
         return self._models[cache_key]
     
+    def configure_cpu_threads(self, num_threads: int) -> None:
+        """
+        Set the number of threads torch uses for CPU inference.
+        
+        Args:
+            num_threads: Intra-op threads for each forward pass
+        """
+        torch.set_num_threads(num_threads)
+        try:
+            # Parallelism comes from the batch dimension, not from running ops side by side
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has started
+            pass
+    
     def clear_cache(self):
         """Clear all cached models."""
         self._models.clear()
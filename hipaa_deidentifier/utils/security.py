@@ -7,7 +7,54 @@ import os
 import hmac
 import hashlib
 import re
-from typing import Dict, Optional
+import warnings
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from blake3 import blake3
+except ImportError:  # blake3 is optional; only needed when hash_algo is blake3
+    blake3 = None
+
+
+# Hash algorithms selectable through security.hash_algo
+HASH_ALGO_HMAC_SHA256 = "hmac-sha256"
+HASH_ALGO_BLAKE3 = "blake3"
+HASH_ALGO_BLAKE2B = "blake2b"
+
+
+def _resolve_salt(salt: str) -> str:
+    """
+    Returns the salt to use, falling back to a non-production salt if none is configured.
+    
+    Args:
+        salt: The configured salt value
+        
+    Returns:
+        The salt to use for hashing
+    """
+    if not salt or salt == "DEFAULT_SALT_REPLACE_IN_PRODUCTION":
+        # Use a fallback salt if none provided, but this is not recommended for production
+        warnings.warn("Using default salt for hashing. This is not secure for production use.")
+        salt = "HIPAA_DEFAULT_SALT_NOT_FOR_PRODUCTION_USE"
+    
+    return salt
+
+
+def _validate_hash_inputs(text: str, salt: str) -> str:
+    """
+    Validates hash inputs and returns the salt to use.
+    
+    Args:
+        text: The text to hash
+        salt: The configured salt value
+        
+    Returns:
+        The salt to use, falling back to a non-production salt if none is configured
+    """
+    if not text:
+        raise ValueError("Cannot hash empty text")
+    
+    return _resolve_salt(salt)
 
 
 def generate_secure_hash(text: str, salt: str, length: int = 12) -> str:
@@ -23,14 +70,7 @@ def generate_secure_hash(text: str, salt: str, length: int = 12) -> str:
         A hexadecimal string of the specified length
     """
     # Validate inputs
-    if not text:
-        raise ValueError("Cannot hash empty text")
-        
-    if not salt or salt == "DEFAULT_SALT_REPLACE_IN_PRODUCTION":
-        # Use a fallback salt if none provided, but this is not recommended for production
-        import warnings
-        warnings.warn("Using default salt for hashing. This is not secure for production use.")
-        salt = "HIPAA_DEFAULT_SALT_NOT_FOR_PRODUCTION_USE"
+    salt = _validate_hash_inputs(text, salt)
     
     # Enforce minimum length for security
     actual_length = max(length, 8)
@@ -40,6 +80,83 @@ def generate_secure_hash(text: str, salt: str, length: int = 12) -> str:
     return h.hexdigest()[:actual_length]
 
 
+def _derive_hash_key(salt: str) -> bytes:
+    """
+    Derives the 32-byte key used by the keyed BLAKE hashes from the salt.
+    
+    Args:
+        salt: The resolved salt value
+        
+    Returns:
+        A 32-byte key (the size BLAKE3 keyed mode requires)
+    """
+    return hashlib.sha256(salt.encode('utf-8')).digest()
+
+
+def _blake2b_hash(text: str, salt: str, length: int = 12) -> str:
+    """
+    Generates a keyed BLAKE2b hash, with the key derived from the salt.
+    
+    This is intended for pseudonym generation where HMAC semantics aren't required.
+    The output is truncated to the same length as generate_secure_hash, so collision
+    resistance is unchanged (48 bits at the default length); only hashing is faster.
+    
+    Args:
+        text: The text to hash
+        salt: A salt value from which the hash key is derived
+        length: The desired length of the output hash code (minimum 8 recommended)
+        
+    Returns:
+        A hexadecimal string of the specified length
+    """
+    salt = _validate_hash_inputs(text, salt)
+    actual_length = max(length, 8)
+    
+    h = hashlib.blake2b(text.encode('utf-8'), key=_derive_hash_key(salt))
+    return h.hexdigest()[:actual_length]
+
+
+def _blake3_hash(text: str, salt: str, length: int = 12) -> str:
+    """
+    Generates a keyed BLAKE3 hash, with the key derived from the salt.
+    
+    Args:
+        text: The text to hash
+        salt: A salt value from which the hash key is derived
+        length: The desired length of the output hash code (minimum 8 recommended)
+        
+    Returns:
+        A hexadecimal string of the specified length
+    """
+    salt = _validate_hash_inputs(text, salt)
+    actual_length = max(length, 8)
+    
+    h = blake3(text.encode('utf-8'), key=_derive_hash_key(salt))
+    return h.hexdigest()[:actual_length]
+
+
+def get_hash_function(algorithm: str) -> Callable[[str, str, int], str]:
+    """
+    Returns the hash function for the configured algorithm.
+    
+    Args:
+        algorithm: One of "hmac-sha256" (default), "blake3" or "blake2b"
+        
+    Returns:
+        A function with the signature (text, salt, length) -> hex string
+    """
+    if algorithm == HASH_ALGO_HMAC_SHA256:
+        return generate_secure_hash
+    if algorithm == HASH_ALGO_BLAKE2B:
+        return _blake2b_hash
+    if algorithm == HASH_ALGO_BLAKE3:
+        # No fallback: another algorithm would silently change every pseudonym
+        if blake3 is None:
+            raise ValueError("Hash algorithm 'blake3' is configured but the blake3 package is not installed")
+        return _blake3_hash
+    raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+
 def get_salt_from_config(config: Optional[dict] = None) -> str:
     """
     Retrieves the salt value from centralized configuration.
@@ -114,9 +231,46 @@ class PseudonymManager:
         self.salt = get_salt_from_config(config)
         self.pseudonym_cache = {}  # Cache of entity text to pseudonym mapping
         
-    def get_pseudonym(self, entity_text: str, entity_type: str, patient_id: Optional[str] = None) -> str:
+        # HMAC-SHA256 stays the default for compliance-strict deployments
+        hash_algo = config.get("security", {}).get("hash_algo", HASH_ALGO_HMAC_SHA256)
+        self.hash_fn = get_hash_function(hash_algo)
+        
+        # Keyed HMAC state reused (via copy) by get_pseudonyms_bulk
+        self._hmac_template = None
+        if hash_algo == HASH_ALGO_HMAC_SHA256:
+            self._hmac_template = hmac.new(_resolve_salt(self.salt).encode('utf-8'), digestmod=hashlib.sha256)
+        
+        # Pseudonym templates pre-split around "{code}" once, instead of per call
+        formats = config.get("pseudonym_formats", {}) or {}
+        self._default_fmt = self._split_template(formats.get("DEFAULT") or "{code}")
+        self._fmt_table = {
+            entity_type: self._split_template(template)
+            for entity_type, template in formats.items()
+            if template
+        }
+        
+    @staticmethod
+    def _split_template(template: str):
         """
-        Get a consistent pseudonym for an entity.
+        Split a pseudonym template into (prefix, suffix) around a single "{code}".
+        
+        Templates with other placeholders or escaped braces are kept as-is and
+        rendered with str.format.
+        
+        Args:
+            template: Format template such as "PERSON_{code}"
+            
+        Returns:
+            A (prefix, suffix) tuple, or the original template string
+        """
+        prefix, sep, suffix = template.partition("{code}")
+        if sep and not any(ch in prefix + suffix for ch in "{}"):
+            return prefix, suffix
+        return template
+        
+    def _build_cache_key(self, entity_text: str, entity_type: str, patient_id: Optional[str] = None) -> Optional[str]:
+        """
+        Build the cache key (and hash input) for an entity.
         
         Args:
             entity_text: The original entity text
@@ -124,12 +278,12 @@ class PseudonymManager:
             patient_id: Optional patient identifier for context
             
         Returns:
-            A consistent pseudonym for the entity
+            The cache key, or None if the text is too short to pseudonymize
         """
         # Fix issue #4: Hashes / Noise Injected
         # Don't generate pseudonyms for very short text (likely false positives)
         if len(entity_text.strip()) < 3 and entity_type not in ["AGE", "AGE_OVER_89"]:
-            return entity_text
+            return None
             
         # Create a cache key that includes entity type
         if entity_type == "NAME":
@@ -143,22 +297,85 @@ class PseudonymManager:
         if patient_id:
             cache_key = f"{patient_id}:{cache_key}"
             
+        return cache_key
+    
+    def _format_pseudonym(self, hash_code: str, entity_type: str) -> str:
+        """
+        Format a hash code according to the configured pseudonym format.
+        
+        Args:
+            hash_code: The generated hash code
+            entity_type: The type of entity (e.g., NAME, MRN)
+            
+        Returns:
+            The formatted pseudonym
+        """
+        template = self._fmt_table.get(entity_type, self._default_fmt)
+        if type(template) is tuple:
+            return template[0] + hash_code + template[1]
+        return template.format(code=hash_code)
+        
+    def get_pseudonym(self, entity_text: str, entity_type: str, patient_id: Optional[str] = None) -> str:
+        """
+        Get a consistent pseudonym for an entity.
+        
+        Args:
+            entity_text: The original entity text
+            entity_type: The type of entity (e.g., NAME, MRN)
+            patient_id: Optional patient identifier for context
+            
+        Returns:
+            A consistent pseudonym for the entity
+        """
+        cache_key = self._build_cache_key(entity_text, entity_type, patient_id)
+        if cache_key is None:
+            return entity_text
+            
         # Use cached value if available
         if cache_key in self.pseudonym_cache:
             return self.pseudonym_cache[cache_key]
             
-        # Generate a hash code
-        hash_code = generate_secure_hash(cache_key, self.salt)
-        
-        # Format according to configuration
-        format_template = (
-            self.config.get("pseudonym_formats", {}).get(entity_type) or 
-            self.config.get("pseudonym_formats", {}).get("DEFAULT") or 
-            "{code}"
-        )
-        pseudonym = format_template.format(code=hash_code)
+        # Generate a hash code and format according to configuration
+        hash_code = self.hash_fn(cache_key, self.salt)
+        pseudonym = self._format_pseudonym(hash_code, entity_type)
         
         # Cache the result
         self.pseudonym_cache[cache_key] = pseudonym
         
-        return pseudonym
\ No newline at end of file
+        return pseudonym
+    
+    def get_pseudonyms_bulk(self, items: List[Tuple[str, str, Optional[str]]]) -> List[str]:
+        """
+        Get consistent pseudonyms for a batch of entities.
+        
+        Cache keys are computed up front and only unique cache misses are hashed,
+        reusing a pre-keyed HMAC state instead of re-keying for every entity.
+        
+        Args:
+            items: List of (entity_text, entity_type, patient_id) tuples
+            
+        Returns:
+            List of pseudonyms in the same order as the input
+        """
+        keys = [self._build_cache_key(text, entity_type, patient_id) for text, entity_type, patient_id in items]
+        
+        # Hash each missing key once
+        missing = {}
+        for key, (_, entity_type, _) in zip(keys, items):
+            if key is not None and key not in self.pseudonym_cache:
+                missing.setdefault(key, entity_type)
+        
+        template = self._hmac_template
+        for key, entity_type in missing.items():
+            if template is not None:
+                h = template.copy()
+                h.update(key.encode('utf-8'))
+                hash_code = h.hexdigest()[:12]
+            else:
+                hash_code = self.hash_fn(key, self.salt)
+            self.pseudonym_cache[key] = self._format_pseudonym(hash_code, entity_type)
+        
+        return [
+            text if key is None else self.pseudonym_cache[key]
+            for key, (text, _, _) in zip(keys, items)
+        ]
\ No newline at end of file
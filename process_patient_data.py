@@ -49,6 +49,16 @@ from tabulate import tabulate
 # Import the deidentifier from deidentify.py
 from hipaa_deidentifier.deidentifier_modular import HIPAADeidentifierModular
 from config.config import config as global_config
+from hipaa_deidentifier.utils.json_output import write_json
+
+# Output directories already created in this process
+_CREATED_DIRS = set()
+
+def _ensure_dir(path):
+    """Create a directory once per process, skipping the mkdir syscall for known directories."""
+    if path not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(path)
 
 def list_available_files():
     """List all available text files in the data directory."""
@@ -67,7 +77,7 @@ def get_output_paths(file_path):
     """Generate output paths for JSON and text files based on the input file path."""
     # Create deidentified_data folder if it doesn't exist
     deidentified_dir = Path("deidentified_data")
-    deidentified_dir.mkdir(exist_ok=True)
+    _ensure_dir(deidentified_dir)
 
     # Determine category from file path
     file_path_obj = Path(file_path)
@@ -85,7 +95,7 @@ def get_output_paths(file_path):
 
     # Create category subfolder
     category_dir = deidentified_dir / category
-    category_dir.mkdir(exist_ok=True)
+    _ensure_dir(category_dir)
 
     # Generate output filenames based on input filename
     base_name = file_path_obj.stem  # Get filename without extension
@@ -151,8 +161,7 @@ def process_file(file_path, show_colored=False):
         print(f"\nSaving results to {json_output_path} and {text_output_path}")
 
         # Save JSON result
-        with open(json_output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        write_json(json_output_path, result)
 
         # Save text result
         with open(text_output_path, "w", encoding="utf-8") as f:
@@ -0,0 +1,24 @@
+"""Regression tests for date parsing and shifting."""
+from hipaa_deidentifier.utils.date_shifter import parse_date, shift_date
+
+
+def test_parenthesized_date_is_shifted():
+    dt, fmt = parse_date("(01/15/2023)")
+    assert dt is not None and fmt == "custom"
+    assert shift_date("(01/15/2023)", 30) == "02/14/2023"
+
+
+def test_long_date_with_context_is_shifted():
+    text = "Admission date/time 01/15/2023 14:30:00 EST"
+    dt, fmt = parse_date(text)
+    assert dt is not None and fmt == "custom"
+    assert shift_date(text, 30) == "02/14/2023"
+
+
+def test_compact_date_still_parsed():
+    dt, fmt = parse_date("20230115")
+    assert fmt == "%Y%m%d" and (dt.year, dt.month, dt.day) == (2023, 1, 15)
+
+
+def test_non_date_rejected():
+    assert parse_date("no digits here") == (None, None)
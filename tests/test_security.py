@@ -0,0 +1,21 @@
+"""Tests for the configurable pseudonym hash functions."""
+import hashlib
+
+import pytest
+
+from hipaa_deidentifier.utils import security
+from hipaa_deidentifier.utils.security import HASH_ALGO_BLAKE2B, get_hash_function
+
+
+def test_blake2b_is_keyed_by_salt():
+    hash_fn = get_hash_function(HASH_ALGO_BLAKE2B)
+    key = hashlib.sha256(b"salt").digest()
+    expected = hashlib.blake2b(b"NAME:john", key=key).hexdigest()[:12]
+    assert hash_fn("NAME:john", "salt") == expected
+    assert hash_fn("NAME:john", "other-salt") != expected
+
+
+def test_blake3_without_package_is_a_configuration_error(monkeypatch):
+    monkeypatch.setattr(security, "blake3", None)
+    with pytest.raises(ValueError):
+        security.get_hash_function(security.HASH_ALGO_BLAKE3)